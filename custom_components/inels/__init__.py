@@ -1,17 +1,56 @@
 """The iNels integration."""
 from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
 from typing import Any
 
 from inelsmqtt import InelsMqtt
+from inelsmqtt.const import MQTT_TOTAL_STATUS_TOPIC, MQTT_TRANSPORT
+from inelsmqtt.devices import Device
 from inelsmqtt.discovery import InelsDiscovery
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_DISCOVERY,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_USERNAME,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr, entity_registry as er
-
-from .const import BROKER, BROKER_CONFIG, DEVICES, DOMAIN, LOGGER, OLD_ENTITIES
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .access import (
+    InelsAccessList,
+    access_store,
+    async_setup_services,
+    async_unload_services,
+)
+from .const import (
+    ACCESS,
+    BROKER,
+    BROKER_CONFIG,
+    COMMANDS,
+    DEVICES,
+    DOMAIN,
+    EXECUTOR,
+    HOT_PLUG,
+    LOGGER,
+    OLD_ENTITIES,
+    OPTIONS,
+    SIGNAL_NEW_DEVICE,
+    UNLOAD_TIMEOUT,
+)
+from .executor import InelsExecutor
+from .health import broker_device_info
+from .hotplug import InelsHotPlug, find_device
+from .metrics import get_metrics
+from .profiler import async_setup_profiler
+from .travel import travel_store
 
 PLATFORMS: list[Platform] = [
     Platform.BUTTON,
@@ -22,15 +61,82 @@ PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
     Platform.BINARY_SENSOR,
     Platform.SELECT,
+    Platform.EVENT,
 ]
 
+# the broker setup step of the options mirrors these into the options
+BROKER_OPTIONS = {
+    CONF_HOST,
+    CONF_PORT,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    MQTT_TRANSPORT,
+    CONF_DISCOVERY,
+}
 
-async def _async_config_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Call when config entry being updated."""
 
-    client: InelsMqtt = hass.data[BROKER]
+def _connect_broker(config: Mapping[str, Any]) -> InelsMqtt | int:
+    """Create a broker session and test it, return the error code on failure."""
+    mqtt = InelsMqtt(config)
+    if isinstance(error := mqtt.test_connection(), int):
+        return error
+    return mqtt
+
 
-    await hass.async_add_executor_job(client.disconnect)
+def _swap_broker(old: InelsMqtt, new: InelsMqtt, hot_plug: InelsHotPlug) -> None:
+    """Close the old session and listen to all the devices on the new one."""
+    old.unsubscribe_listeners()
+    old.disconnect()
+    new.subscribe(MQTT_TOTAL_STATUS_TOPIC)
+    hot_plug.swap_broker(new)
+
+
+async def _async_config_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Call when config entry being updated.
+
+    A changed broker configuration swaps the session in place, the devices and
+    entities are kept. Changed tuning options are read at the platform setup,
+    they still reload the entry.
+    """
+    inels_data: dict[str, Any] = hass.data[DOMAIN][entry.entry_id]
+
+    options: dict[str, Any] = inels_data[OPTIONS]
+    changed = {
+        key
+        for key in {*options, *entry.options}
+        if options.get(key) != entry.options.get(key)
+    }
+    inels_data[OPTIONS] = dict(entry.options)
+    if changed - BROKER_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    if inels_data[BROKER_CONFIG] == entry.data:
+        return
+    inels_data[BROKER_CONFIG] = entry.data
+
+    executor: InelsExecutor = inels_data[EXECUTOR]
+    new = await executor.async_run(_connect_broker, entry.data)
+    if isinstance(new, int):
+        LOGGER.warning("Cannot connect to the new broker (%s), reloading", new)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # hand the routing table and the last statuses over to the new session
+    old: InelsMqtt = inels_data[BROKER]
+    new.list_of_listeners.update(old.list_of_listeners)
+    new.messages().update(old.messages())
+    for device in inels_data[DEVICES]:
+        # the library has no setter for the session of a device
+        device._Device__mqtt = new  # pylint: disable=protected-access
+    inels_data[BROKER] = new
+
+    await executor.async_run(_swap_broker, old, new, inels_data[HOT_PLUG])
+    get_metrics(hass, entry.entry_id).track_reconnects(new)
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, **broker_device_info(entry)
+    )
+    LOGGER.info("Switched to the broker at %s", entry.data[CONF_HOST])
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -40,21 +146,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         LOGGER.error("MQTT broker is not configured")
         return False
 
+    # the broker I/O of the entry runs on its own threads, not the shared ones
+    executor = InelsExecutor(hass, entry.entry_id)
     inels_data: dict[str, Any] = {
         BROKER_CONFIG: entry.data,
+        OPTIONS: dict(entry.options),
+        EXECUTOR: executor,
     }
 
-    mqtt: InelsMqtt = await hass.async_add_executor_job(
-        InelsMqtt, inels_data[BROKER_CONFIG]
-    )
+    mqtt: InelsMqtt = await executor.async_run(InelsMqtt, inels_data[BROKER_CONFIG])
 
     inels_data[BROKER] = mqtt
 
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(_async_config_entry_updated))
 
     if isinstance(  # None -> no error, int -> error code
-        await hass.async_add_executor_job(inels_data[BROKER].test_connection), int
+        await executor.async_run(inels_data[BROKER].test_connection), int
     ):
+        executor.shutdown()
         return False
 
     if hass.data.get(DOMAIN) is None:
@@ -62,26 +171,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     try:
         i_disc = InelsDiscovery(inels_data[BROKER])
-        await hass.async_add_executor_job(i_disc.discovery)
+        await executor.async_run(i_disc.discovery)
 
         inels_data[DEVICES] = i_disc.devices
     except Exception as exc:
-        await hass.async_add_executor_job(mqtt.close)
+        await executor.async_run(mqtt.close)
+        executor.shutdown()
         raise ConfigEntryNotReady from exc
 
     LOGGER.info("Finished discovery, setting up platforms")
 
+    # card readers check the read cards against the access list
+    access_list = InelsAccessList(hass, access_store(hass, entry.entry_id))
+    await access_list.async_load()
+
+    @callback
+    def async_track_reader(device: Device) -> None:
+        if hasattr(device.state, "card_present"):
+            entry.async_on_unload(access_list.async_track_reader(device))
+
+    for device in inels_data[DEVICES]:
+        async_track_reader(device)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICE.format(entry.entry_id), async_track_reader
+        )
+    )
+    inels_data[ACCESS] = access_list
+    async_setup_services(hass)
+    async_setup_profiler(hass)
+
+    # virtual device of the broker, holding the integration health sensors
+    get_metrics(hass, entry.entry_id).track_reconnects(mqtt)
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, **broker_device_info(entry)
+    )
+
     # save entity ids of old entities
-    old_entries: dict[str, list[str]] = {}
+    # sets, so each platform removes its entities in linear time
+    old_entries: dict[str, set[str]] = {}
 
     entity_registry = er.async_get(hass)
     registry_entries: list[er.RegistryEntry] = er.async_entries_for_config_entry(
         entity_registry, entry.entry_id
     )
     for entity in registry_entries:
-        if not entity.domain in old_entries:
-            old_entries[entity.domain] = []
-        old_entries[entity.domain].append(entity.entity_id)
+        old_entries.setdefault(entity.domain, set()).add(entity.entity_id)
 
     inels_data[OLD_ENTITIES] = old_entries
 
@@ -89,10 +224,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     LOGGER.info("Platform setup complete")
 
+    # devices plugged in from now on are added without a reload
+    hot_plug = InelsHotPlug(
+        hass, entry.entry_id, executor, mqtt, inels_data[DEVICES]
+    )
+    await executor.async_run(hot_plug.start)
+    inels_data[HOT_PLUG] = hot_plug
+
     LOGGER.info("Cleaning up entities/devices")
 
     # remove the old entities that aren't being used
-    remaining_entries: dict[str, list[str]] = hass.data[DOMAIN][entry.entry_id][
+    remaining_entries: dict[str, set[str]] = hass.data[DOMAIN][entry.entry_id][
         OLD_ENTITIES
     ]
     for platform in remaining_entries:
@@ -125,18 +267,55 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    hass_data = hass.data[DOMAIN][entry.entry_id]
+    """Unload a config entry.
+
+    Once the platforms unloaded, the broker session is closed in the executor,
+    a broker not answering does not hold the unload longer than the timeout.
+    A failed platform unload keeps the entry running on its session.
+    """
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+
+    hass_data = hass.data[DOMAIN].pop(entry.entry_id)
+    if not hass.data[DOMAIN]:
+        hass.data.pop(DOMAIN)
+        async_unload_services(hass)
     broker: InelsMqtt = hass_data[BROKER]
+    executor: InelsExecutor = hass_data[EXECUTOR]
 
-    broker.unsubscribe_listeners()
-    broker.disconnect()
+    def close_broker() -> None:
+        broker.unsubscribe_listeners()
+        broker.disconnect()
 
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+    try:
+        async with asyncio.timeout(UNLOAD_TIMEOUT):
+            await executor.async_run(close_broker)
+    except TimeoutError:
+        LOGGER.warning("Timed out disconnecting from the MQTT broker")
+    finally:
+        # a broker still not answering keeps only its own thread
+        executor.shutdown()
+
+    return True
 
-    if hass.data[DOMAIN]:
-        hass.data.pop(DOMAIN)
 
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device_entry: dr.DeviceEntry
+) -> bool:
+    """Retire a device removed by the user, its entities go with it."""
+    inels_data = hass.data[DOMAIN][entry.entry_id]
+    device = find_device(inels_data[DEVICES], device_entry.identifiers)
+    if device is None:
+        return True  # the broker or a device already gone
+
+    inels_data[HOT_PLUG].async_retire(device)
+    inels_data.get(COMMANDS, {}).pop(device.unique_id, None)
+    get_metrics(hass, entry.entry_id).devices.pop(device.unique_id, None)
+    LOGGER.info("Device %s removed", device.unique_id)
     return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored cover travel times and access list of the config entry."""
+    await travel_store(hass, entry.entry_id).async_remove()
+    await access_store(hass, entry.entry_id).async_remove()
@@ -0,0 +1,190 @@
+"""Access list of iNELS card readers."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from inelsmqtt.devices import Device
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ACCESS,
+    ATTR_CARD_ID,
+    DOMAIN,
+    EVENT_CARD_ACCEPTED,
+    EVENT_CARD_REJECTED,
+    SERVICE_ADD_CARD,
+    SERVICE_REMOVE_CARD,
+)
+from .entity import add_device_callback
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 1  # s
+
+
+def normalize_card_id(card_id: str) -> int:
+    """Return the card ID (hex string, leading zeros optional) as a number."""
+    return int(card_id, 16)
+
+
+def _valid_card_id(value: Any) -> str:
+    """Validate a card ID given to the services."""
+    card_id = cv.string(value).strip()
+    try:
+        normalize_card_id(card_id)
+    except ValueError as exc:
+        raise vol.Invalid(f"Invalid card ID {card_id}") from exc
+    return card_id
+
+
+CARD_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_CARD_ID): vol.All(cv.ensure_list, [_valid_card_id])}
+)
+
+
+def access_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the access list of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.access")
+
+
+class InelsAccessList:
+    """Authorized card IDs, checked by the readers in the status callback.
+
+    The set is replaced, never mutated, so the mqtt thread can read it while
+    the loop updates it.
+    """
+
+    def __init__(self, hass: HomeAssistant, store: Store[dict[str, Any]]) -> None:
+        """Initialize the access list."""
+        self._hass = hass
+        self._store = store
+        self._cards: frozenset[int] = frozenset()
+
+    async def async_load(self) -> None:
+        """Load the stored card IDs."""
+        data = await self._store.async_load() or {}
+        self._cards = frozenset(
+            normalize_card_id(card_id) for card_id in data.get("cards", [])
+        )
+
+    def is_authorized(self, card_id: str) -> bool:
+        """Return if the card is on the access list."""
+        try:
+            return normalize_card_id(card_id) in self._cards
+        except ValueError:
+            return False
+
+    @callback
+    def async_add(self, card_ids: list[str]) -> None:
+        """Authorize the cards."""
+        self._cards = self._cards | {normalize_card_id(card) for card in card_ids}
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, card_ids: list[str]) -> None:
+        """Revoke the cards."""
+        self._cards = self._cards - {normalize_card_id(card) for card in card_ids}
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_track_reader(self, device: Device) -> Callable[[], None]:
+        """Check the cards read by the device, return the remover."""
+        reader = InelsCardReader(self._hass, device, self)
+        removers = [
+            add_device_callback(device, key, -1, reader.status_changed)
+            for key in ("card_present", "card_id")
+        ]
+
+        def remove_reader() -> None:
+            for remover in removers:
+                remover()
+
+        return remove_reader
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"cards": [f"{card:X}" for card in sorted(self._cards)]}
+
+
+class InelsCardReader:
+    """Fire the access events of a card reader on each new card."""
+
+    __slots__ = ("_hass", "_device", "_access_list", "_present", "_card_id")
+
+    def __init__(
+        self, hass: HomeAssistant, device: Device, access_list: InelsAccessList
+    ) -> None:
+        """Initialize the reader."""
+        self._hass = hass
+        self._device = device
+        self._access_list = access_list
+        self._present: bool = device.state.card_present
+        self._card_id: str = device.state.card_id
+
+    def status_changed(self) -> None:
+        """Check a newly presented card, runs in the mqtt thread."""
+        present = self._device.state.card_present
+        card_id = self._device.state.card_id
+        if present and (not self._present or card_id != self._card_id):
+            self._hass.loop.call_soon_threadsafe(
+                self._async_fire, card_id, self._access_list.is_authorized(card_id)
+            )
+        self._present = present
+        self._card_id = card_id
+
+    @callback
+    def _async_fire(self, card_id: str, accepted: bool) -> None:
+        """Fire the access event with the reader device."""
+        device_entry = dr.async_get(self._hass).async_get_device(
+            identifiers={(DOMAIN, self._device.unique_id)}
+        )
+        self._hass.bus.async_fire(
+            EVENT_CARD_ACCEPTED if accepted else EVENT_CARD_REJECTED,
+            {
+                "device_id": device_entry.id if device_entry else None,
+                "reader": self._device.unique_id,
+                ATTR_CARD_ID: card_id,
+            },
+        )
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services managing the access lists."""
+    if hass.services.has_service(DOMAIN, SERVICE_ADD_CARD):
+        return
+
+    def _access_lists() -> list[InelsAccessList]:
+        return [
+            data[ACCESS]
+            for data in hass.data.get(DOMAIN, {}).values()
+            if isinstance(data, dict) and ACCESS in data
+        ]
+
+    @callback
+    def async_add_card(call: ServiceCall) -> None:
+        for access_list in _access_lists():
+            access_list.async_add(call.data[ATTR_CARD_ID])
+
+    @callback
+    def async_remove_card(call: ServiceCall) -> None:
+        for access_list in _access_lists():
+            access_list.async_remove(call.data[ATTR_CARD_ID])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_ADD_CARD, async_add_card, schema=CARD_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REMOVE_CARD, async_remove_card, schema=CARD_SCHEMA
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services managing the access lists, with the last entry."""
+    hass.services.async_remove(DOMAIN, SERVICE_ADD_CARD)
+    hass.services.async_remove(DOMAIN, SERVICE_REMOVE_CARD)
@@ -0,0 +1,68 @@
+"""Edge-triggered alerts of iNELS channels."""
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+from homeassistant.helpers.entity import Entity
+
+from .const import EVENT_ALERT, LOGGER
+
+
+class InelsAlertType(Protocol):
+    """Alert property description shared by the platforms."""
+
+    key: str
+    name: str
+    message: str
+
+
+class InelsAlertTracker:
+    """Keep the alert flags of one channel and report only their transitions.
+
+    It is evaluated once per status message of the channel, from the device
+    callback, so reading the entity state does not scan the alerts again.
+    """
+
+    __slots__ = ("_alerts", "_active")
+
+    def __init__(self, alerts: list[InelsAlertType] | None) -> None:
+        """Initialize the tracker."""
+        self._alerts = alerts or []
+        self._active: set[str] = set()
+
+    @property
+    def active(self) -> bool:
+        """Return if any of the alerts is raised."""
+        return bool(self._active)
+
+    def reset(self, channel: Any) -> None:
+        """Take the current alert flags as they are, without reporting them."""
+        self._active = {
+            alert.key for alert in self._alerts if getattr(channel, alert.key, False)
+        }
+
+    def update(self, entity: Entity, device_id: str, channel: Any) -> None:
+        """Compare the alert flags of the channel and report the changed ones."""
+        for alert in self._alerts:
+            raised = bool(getattr(channel, alert.key, False))
+            if raised == (alert.key in self._active):
+                continue
+
+            if raised:
+                self._active.add(alert.key)
+                LOGGER.warning(alert.message, entity.name, device_id)
+            else:
+                self._active.discard(alert.key)
+                LOGGER.info("Alert %s of %s cleared", alert.key, entity.name)
+
+            if entity.hass is not None:
+                # thread safe, the device callbacks run in the mqtt thread
+                entity.hass.bus.fire(
+                    EVENT_ALERT,
+                    {
+                        "device_id": device_id,
+                        "entity_id": entity.entity_id,
+                        "alert": alert.key,
+                        "active": raised,
+                    },
+                )
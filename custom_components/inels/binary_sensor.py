@@ -1,9 +1,13 @@
 """iNELS binary sensor entity."""
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+from functools import cache
+from typing import Any
 
 from inelsmqtt.devices import Device
+import voluptuous as vol
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -11,13 +15,21 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_ON, Platform
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers import entity_platform, entity_registry as er
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
+from .alert import InelsAlertType
 from .entity import InelsBaseEntity
+from .hotplug import async_listen_new_devices
+from .light import INELS_LIGHT_TYPES
+from .switch import INELS_SWITCH_TYPES
 from .const import (
+    CONF_DEBOUNCE_WINDOW,
+    DEFAULT_DEBOUNCE_WINDOW,
     DEVICES,
     DOMAIN,
     ICON_BINARY_INPUT,
@@ -27,11 +39,14 @@ from .const import (
     ICON_SNOWFLAKE,
     LOGGER,
     OLD_ENTITIES,
+    SERVICE_SET_DEBOUNCE,
 )
 
+ATTR_SUPPRESSED = "suppressed_transitions"
+
 
 # BINARY SENSOR PLATFORM
-@dataclass
+@dataclass(slots=True)
 class InelsBinarySensorType:
     """Binary sensor type property description"""
 
@@ -110,14 +125,17 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS binary sensor."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.BINARY_SENSOR)
 
-    items = INELS_BINARY_SENSOR_TYPES.items()
-    entities: list[InelsBaseEntity] = []
-    for device in device_list:
-        for key, type_dict in items:
+    debounce = (
+        config_entry.options.get(CONF_DEBOUNCE_WINDOW, DEFAULT_DEBOUNCE_WINDOW) / 1000
+    )
+
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        entities: list[InelsBaseEntity] = []
+        for key, type_dict in INELS_BINARY_SENSOR_TYPES.items():
             if hasattr(device.state, key):
                 if type_dict.is_binary_input:
                     binary_sensor_type = InelsBinaryInputSensor
@@ -130,12 +148,8 @@ async def async_setup_entry(
                             device=device,
                             key=key,
                             index=-1,
-                            description=InelsBinarySensorEntityDescription(
-                                key=key,
-                                name=type_dict.name,
-                                icon=type_dict.icon,
-                                device_class=type_dict.device_class,
-                            ),
+                            description=_binary_sensor_description(key, -1),
+                            debounce=debounce,
                         )
                     )
                 else:
@@ -145,26 +159,213 @@ async def async_setup_entry(
                                 device=device,
                                 key=key,
                                 index=k,
-                                description=InelsBinarySensorEntityDescription(
-                                    key=f"{key}{k}",
-                                    name=f"{type_dict.name} {k+1}",
-                                    icon=type_dict.icon,
-                                    device_class=type_dict.device_class,
-                                ),
+                                description=_binary_sensor_description(key, k),
+                                debounce=debounce,
                             )
                         )
 
+        entities.extend(_alert_entities(device))
+        return entities
+
+    entities = [entity for device in device_list for entity in device_entities(device)]
     async_add_entities(entities, True)
+    async_listen_new_devices(
+        hass, config_entry, device_entities, async_add_entities, True
+    )
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_DEBOUNCE,
+        {
+            vol.Required(CONF_DEBOUNCE_WINDOW): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=10000)
+            )
+        },
+        "async_set_debounce",
+    )
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(entity.entity_id for entity in entities)
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.BINARY_SENSOR] = old_entities
 
 
-class InelsBinarySensor(InelsBaseEntity, BinarySensorEntity):
+@cache
+def _binary_sensor_description(
+    key: str, index: int
+) -> InelsBinarySensorEntityDescription:
+    """Return the shared description of a binary sensor, '-1' for no index."""
+    type_dict = INELS_BINARY_SENSOR_TYPES[key]
+    return InelsBinarySensorEntityDescription(
+        key=key if index == -1 else f"{key}{index}",
+        name=type_dict.name if index == -1 else f"{type_dict.name} {index+1}",
+        icon=type_dict.icon,
+        device_class=type_dict.device_class,
+    )
+
+
+def _alert_entities(device: Device) -> list[InelsBaseEntity]:
+    """Create the diagnostic alert sensors of the light and relay channels."""
+    entities: list[InelsBaseEntity] = []
+    for types in (INELS_LIGHT_TYPES, INELS_SWITCH_TYPES):
+        for key, type_dict in types.items():
+            if not type_dict.alerts or not hasattr(device.state, key):
+                continue
+
+            channels = device.state.__dict__[key]
+            for k, channel in enumerate(channels):
+                for alert in type_dict.alerts:
+                    if not hasattr(channel, alert.key):
+                        continue
+                    entities.append(
+                        InelsAlertBinarySensor(
+                            device=device,
+                            key=key,
+                            index=k,
+                            alert=alert,
+                            description=_alert_description(
+                                key,
+                                -1 if len(channels) == 1 else k,
+                                alert.key,
+                                alert.name,
+                            ),
+                        )
+                    )
+    return entities
+
+
+@cache
+def _alert_description(
+    key: str, index: int, alert_key: str, alert_name: str
+) -> InelsBinarySensorEntityDescription:
+    """Return the shared description of a channel alert, '-1' for single channel."""
+    type_dict = INELS_LIGHT_TYPES.get(key) or INELS_SWITCH_TYPES[key]
+    return InelsBinarySensorEntityDescription(
+        key=f"{key}_{alert_key}" if index == -1 else f"{key}{index}_{alert_key}",
+        name=alert_name
+        if index == -1
+        else f"{type_dict.name} {index+1} {alert_name}",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    )
+
+
+class InelsDebouncedBinarySensor(InelsBaseEntity, BinarySensorEntity):
+    """Binary sensor written only on the settled transitions of its value.
+
+    A new value is published after it held for the debounce window, values
+    bouncing back meanwhile are counted as suppressed transitions. Status
+    messages changing neither the value nor the availability are not written.
+    """
+
+    def __init__(
+        self, device: Device, key: str, index: int, debounce: float = 0.0
+    ) -> None:
+        """Initialize a debounced binary sensor, debounce window in seconds."""
+        super().__init__(device=device, key=key, index=index)
+
+        self._debounce = debounce
+        self._value: Any = self._read_value()
+        self._pending: asyncio.TimerHandle | None = None
+        self._pending_value: Any = None
+        self._suppressed = 0
+        self._written_available: bool | None = None
+
+    def _read_value(self) -> Any:
+        """Return the current raw value of the device."""
+        if self.index != -1:
+            return self._device.values.ha_value.__dict__[self.key][self.index]
+        return self._device.values.ha_value.__dict__[self.key]
+
+    async def _async_restore(self, state: State) -> None:
+        """Take the last value, a bool also stands for the 0/1 of binary inputs."""
+        await super()._async_restore(state)
+        self._value = state.state == STATE_ON
+
+    @property
+    def _debounce_window(self) -> float:
+        """Return the window of the sensor, the one set by the service wins."""
+        if self.registry_entry is not None:
+            options = self.registry_entry.options.get(DOMAIN, {})
+            if CONF_DEBOUNCE_WINDOW in options:
+                return options[CONF_DEBOUNCE_WINDOW] / 1000
+        return self._debounce
+
+    def _callback(self) -> None:
+        """Hand the new value over to the loop."""
+        if self.hass is not None:
+            # runs in the mqtt thread
+            self.hass.loop.call_soon_threadsafe(self._async_input, self._read_value())
+
+    @callback
+    def _async_input(self, value: Any) -> None:
+        """Publish the value once it settled, a changed availability right away."""
+        self._async_debounce(value)
+        if self.available != self._written_available:
+            # the device (dis)connected, the debounce does not hold that back
+            self.async_write_ha_state()
+
+    @callback
+    def _async_debounce(self, value: Any) -> None:
+        """Publish the value once it settled."""
+        if self._restored is not None:
+            # the first status replaces the restored value without the window
+            self._restored = None
+            self._async_settle(value)
+            return
+
+        if self._pending is not None:
+            if value == self._pending_value:
+                return
+            # bounced before it settled
+            self._pending.cancel()
+            self._pending = None
+            self._suppressed += 1
+
+        if value == self._value:
+            return
+        if not (window := self._debounce_window):
+            self._async_settle(value)
+            return
+        self._pending_value = value
+        self._pending = self.hass.loop.call_later(window, self._async_settle, value)
+
+    @callback
+    def _async_settle(self, value: Any) -> None:
+        """Take the value as the state of the sensor."""
+        self._pending = None
+        self._value = value
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, keep the availability it was written with."""
+        self._written_available = self.available
+        super().async_write_ha_state()
+
+    async def async_set_debounce(self, debounce_window: int) -> None:
+        """Set the debounce window of the sensor in ms."""
+        er.async_get(self.hass).async_update_entity_options(
+            self.entity_id, DOMAIN, {CONF_DEBOUNCE_WINDOW: debounce_window}
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop the value waiting to settle."""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        await super().async_will_remove_from_hass()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of the transitions suppressed by the debounce."""
+        return {
+            **(super().extra_state_attributes or {}),
+            ATTR_SUPPRESSED: self._suppressed,
+        }
+
+
+class InelsBinarySensor(InelsDebouncedBinarySensor):
     """The platform class for binary sensors for home assistant."""
 
     entity_description: InelsBinarySensorEntityDescription
@@ -175,9 +376,10 @@ class InelsBinarySensor(InelsBaseEntity, BinarySensorEntity):
         key: str,
         index: int,
         description: InelsBinarySensorEntityDescription,
+        debounce: float = 0.0,
     ) -> None:
         """Initialize a binary sensor."""
-        super().__init__(device=device, key=key, index=index)
+        super().__init__(device=device, key=key, index=index, debounce=debounce)
 
         self.entity_description = description
 
@@ -198,13 +400,10 @@ class InelsBinarySensor(InelsBaseEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true is sensor is on."""
-        if self.index != -1:
-            return self._device.values.ha_value.__dict__[self.key][self.index]
-
-        return self._device.values.ha_value.__dict__[self.key]
+        return self._value
 
 
-class InelsBinaryInputSensor(InelsBaseEntity, BinarySensorEntity):
+class InelsBinaryInputSensor(InelsDebouncedBinarySensor):
     """The platform class for binary sensors of binary values for home assistant."""
 
     entity_description: InelsBinarySensorEntityDescription
@@ -215,12 +414,14 @@ class InelsBinaryInputSensor(InelsBaseEntity, BinarySensorEntity):
         key: str,
         index: int,
         description: InelsBinarySensorEntityDescription,
+        debounce: float = 0.0,
     ) -> None:
         """Initialize a binary sensor."""
         super().__init__(
             device=device,
             key=key,
             index=index,
+            debounce=debounce,
         )
 
         self.entity_description = description
@@ -229,24 +430,19 @@ class InelsBinaryInputSensor(InelsBaseEntity, BinarySensorEntity):
         self.entity_id = f"{Platform.BINARY_SENSOR}.{self._attr_unique_id}"
         self._attr_name = f"{self._attr_name} {description.name}"
 
+    @callback
+    def _async_settle(self, value: Any) -> None:
+        """Take the value as the state of the sensor, report alert and tamper."""
+        if value == 2:
+            LOGGER.warning("%s ALERT", self._attr_unique_id)
+        elif value == 3:
+            LOGGER.warning("%s TAMPER", self._attr_unique_id)
+        super()._async_settle(value)
+
     @property
     def available(self) -> bool:
         """Return availability of device."""
-
-        val = self._device.values.ha_value.__dict__[self.key]
-        last_val = self._device.last_values.ha_value.__dict__[self.key]
-        if self.index != -1:
-            val = val[self.index]
-            last_val = last_val[self.index]
-
-        if val in [0, 1]:
-            return True
-        if last_val != val:
-            if val == 2:
-                LOGGER.warning("%s ALERT", self._attr_unique_id)
-            elif val == 3:
-                LOGGER.warning("%s TAMPER", self._attr_unique_id)
-        return False
+        return self._value in [0, 1] and super().available
 
     @property
     def unique_id(self) -> str | None:
@@ -261,6 +457,36 @@ class InelsBinaryInputSensor(InelsBaseEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true is sensor is on."""
-        if self.index != -1:
-            return self._device.values.ha_value.__dict__[self.key][self.index] == 1
-        return self._device.values.ha_value.__dict__[self.key] == 1
+        return self._value == 1
+
+
+class InelsAlertBinarySensor(InelsBaseEntity, BinarySensorEntity):
+    """Diagnostic binary sensor of an alert flag of a light or relay channel."""
+
+    entity_description: InelsBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        device: Device,
+        key: str,
+        index: int,
+        alert: InelsAlertType,
+        description: InelsBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize an alert binary sensor."""
+        super().__init__(device=device, key=key, index=index)
+
+        self.entity_description = description
+        self._alert_key = alert.key
+
+        self._attr_unique_id = slugify(f"{self._attr_unique_id}_{description.key}")
+        self.entity_id = f"{Platform.BINARY_SENSOR}.{self._attr_unique_id}"
+        self._attr_name = f"{self._attr_name} {description.name}"
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the alert is raised."""
+        if (last := self._last_state) is not None:
+            return last.state == STATE_ON
+        channel = self._device.state.__dict__[self.key][self.index]
+        return bool(getattr(channel, self._alert_key, False))
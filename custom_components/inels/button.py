@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cache
 from typing import Any
 
 from inelsmqtt.devices import Device
@@ -25,19 +26,19 @@ from inelsmqtt.const import (
 )
 
 from homeassistant.components.button import (
-    SERVICE_PRESS,
     ButtonDeviceClass,
     ButtonEntity,
     ButtonEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_ENTITY_ID, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
 from .entity import InelsBaseEntity
+from .hotplug import async_listen_new_devices
 from .const import (
     DEVICES,
     DOMAIN,
@@ -56,7 +57,7 @@ from .const import (
 
 
 # BUTTON PLATFORM
-@dataclass
+@dataclass(slots=True)
 class InelsButtonType:
     """Button type property description"""
 
@@ -140,6 +141,68 @@ class InelsButtonDescription(ButtonEntityDescription):
     """A class that describes button entity."""
 
 
+@cache
+def _button_description(key: str, index: int) -> InelsButtonDescription:
+    """Return the shared description of a button."""
+    type_dict = INELS_BUTTON_TYPES[key]
+    return InelsButtonDescription(
+        key=f"{key}{index+1}",
+        name=f"{type_dict.name} {index+1}",
+        icon=type_dict.icon,
+        entity_category=type_dict.entity_category,
+    )
+
+
+@cache
+def _interface_description(inels_type: str, index: int) -> InelsButtonDescription:
+    """Return the shared description of an interface button of a device type."""
+    btn_type = INELS_BUTTON_INTERFACE.get(inels_type)
+    name = f"Interface {index}"
+    icon = ICON_BUTTON
+    category = EntityCategory.CONFIG
+    if btn_type and (index < len(btn_type)):
+        name = btn_type[index].name
+        icon = btn_type[index].icon
+        category = btn_type[index].entity_category
+
+    return InelsButtonDescription(
+        key=f"interface{index}",
+        name=name,
+        icon=icon,
+        entity_category=category,
+    )
+
+
+def button_channels(device: Device) -> list[tuple[str, int, InelsButtonDescription]]:
+    """Return the button channels of a device with their descriptions."""
+    channels: list[tuple[str, int, InelsButtonDescription]] = []
+    for key in INELS_BUTTON_TYPES:
+        if hasattr(device.state, key):
+            for k in range(len(device.state.__dict__[key])):
+                if key == "interface":  # special case
+                    description = _interface_description(device.inels_type, k)
+                else:
+                    description = _button_description(key, k)
+                channels.append((key, k, description))
+    return channels
+
+
+def is_pressed(device: Device, key: str, index: int) -> bool:
+    """Return if the last status of the device pressed the button (rising edge)."""
+    return bool(
+        device.state.__dict__[key][index]
+        and not device.last_values.ha_value.__dict__[key][index]
+    )
+
+
+def is_released(device: Device, key: str, index: int) -> bool:
+    """Return if the last status of the device released the button (falling edge)."""
+    return bool(
+        not device.state.__dict__[key][index]
+        and device.last_values.ha_value.__dict__[key][index]
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -147,61 +210,22 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS buttons from config entry."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.BUTTON)
 
-    items = INELS_BUTTON_TYPES.items()
-    entities: list[InelsBaseEntity] = []
-    for device in device_list:
-        val = device.state
-        for key, type_dict in items:
-            if hasattr(device.state, key):
-                for k in range(len(val.__dict__[key])):
-                    if key == "interface":  # special case
-                        btn_type = INELS_BUTTON_INTERFACE.get(device.inels_type)
-                        name = f"Interface {k}"
-                        icon = ICON_BUTTON
-                        category = EntityCategory.CONFIG
-                        if btn_type and (k < len(btn_type)):
-                            name = btn_type[k].name
-                            icon = btn_type[k].icon
-                            category = btn_type[k].entity_category
-
-                        entities.append(
-                            InelsButton(
-                                device=device,
-                                key="interface",
-                                index=k,
-                                description=InelsButtonDescription(
-                                    key=f"interface{k}",
-                                    name=name,
-                                    icon=icon,
-                                    entity_category=category,
-                                ),
-                            )
-                        )
-                    else:
-                        entities.append(
-                            InelsButton(
-                                device=device,
-                                key=key,
-                                index=k,
-                                description=InelsButtonDescription(
-                                    key=f"{key}{k+1}",
-                                    name=f"{type_dict.name} {k+1}",
-                                    icon=type_dict.icon,
-                                    entity_category=type_dict.entity_category,
-                                ),
-                            )
-                        )
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        return [
+            InelsButton(device=device, key=key, index=k, description=description)
+            for key, k, description in button_channels(device)
+        ]
 
+    entities = [entity for device in device_list for entity in device_entities(device)]
     async_add_entities(entities)
+    async_listen_new_devices(hass, config_entry, device_entities, async_add_entities)
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(entity.entity_id for entity in entities)
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.BUTTON] = old_entities
 
@@ -211,6 +235,7 @@ class InelsButton(InelsBaseEntity, ButtonEntity):
 
     entity_description: InelsButtonDescription
     _attr_device_class: ButtonDeviceClass | None = None
+    _restores_state = False  # the last press is restored by the button itself
 
     def __init__(
         self, device: Device, key: str, index: int, description: InelsButtonDescription
@@ -232,20 +257,14 @@ class InelsButton(InelsBaseEntity, ButtonEntity):
     def _callback(self) -> None:
         super()._callback()
 
-        curr_val = self._device.state
-        last_val = self._device.last_values.ha_value
-
-        if (
-            curr_val.__dict__[self.key][self.index]
-            and not last_val.__dict__[self.key][self.index]
-        ):
-            self.hass.services.call(
-                Platform.BUTTON,
-                SERVICE_PRESS,
-                {ATTR_ENTITY_ID: self.entity_id},
-                True,
-                self._context,
-            )
+        if is_pressed(self._device, self.key, self.index):
+            # runs in the mqtt thread, hand the press over to the loop
+            self.hass.loop.call_soon_threadsafe(self._async_physical_press)
+
+    @callback
+    def _async_physical_press(self) -> None:
+        """Press the button as if pressed in HA, without the service call."""
+        self.hass.async_create_task(self._async_press_action())
 
     def press(self) -> None:
         """Press the button."""
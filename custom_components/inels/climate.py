@@ -1,12 +1,21 @@
 """iNELS climate entity."""
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+from functools import cache
+import math
 
 from inelsmqtt.devices import Device
 from inelsmqtt.const import Climate_modes, Climate_action
+import voluptuous as vol
 
 from homeassistant.components.climate import (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_HVAC_ACTION,
+    ATTR_PRESET_MODE,
+    ATTR_TARGET_TEMP_HIGH,
+    ATTR_TARGET_TEMP_LOW,
     STATE_OFF,
     STATE_ON,
     ClimateEntity,
@@ -19,18 +28,28 @@ from homeassistant.components.climate.const import ClimateEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, Platform, UnitOfTemperature
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
+from .command import InelsChange
 from .entity import InelsBaseEntity
+from .hotplug import async_listen_new_devices
 from .const import (
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
     DEVICES,
     DOMAIN,
+    LOGGER,
     OLD_ENTITIES,
+    SERVICE_SET_ZONE_TEMPERATURE,
+    ZONE_ECHO_TIMEOUT,
+    ZONE_PARALLEL_COMMANDS,
 )
 
+# devices report the setpoint rounded, don't compare it exactly
+TEMPERATURE_TOLERANCE = 0.25
+
 OPERATION_LIST = [
     STATE_OFF,
     STATE_ON,
@@ -61,7 +80,7 @@ CLIMATE_ACTION_TO_HVAC_ACTION = {
 
 
 # CLIMATE PLATFORM
-@dataclass
+@dataclass(slots=True)
 class InelsClimateType:
     """Climate type property description"""
 
@@ -108,36 +127,40 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS climate entities from config entry."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.CLIMATE)
 
-    items = INELS_CLIMATE_TYPES.items()
-    entities: list[InelsBaseEntity] = []
-    for device in device_list:
-        for key, type_dict in items:
-            if hasattr(device.state, key):
-                entities.append(
-                    InelsClimate(
-                        device=device,
-                        key=key,
-                        index=-1,
-                        description=InelsClimateDescription(
-                            key=key,
-                            name=type_dict.name,
-                            hvac_modes=type_dict.hvac_modes,
-                            features=type_dict.features,
-                            presets=type_dict.presets,
-                        ),
-                    )
-                )
-
+    # shared by all climate entities, bounds the publishes of a zone setpoint
+    zone_limiter = asyncio.Semaphore(ZONE_PARALLEL_COMMANDS)
+
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        return [
+            InelsClimate(
+                device=device,
+                key=key,
+                index=-1,
+                description=_climate_description(key),
+                zone_limiter=zone_limiter,
+            )
+            for key in INELS_CLIMATE_TYPES
+            if hasattr(device.state, key)
+        ]
+
+    entities = [entity for device in device_list for entity in device_entities(device)]
     async_add_entities(entities)
+    async_listen_new_devices(hass, config_entry, device_entities, async_add_entities)
+
+    # entity services run the targeted entities concurrently
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_ZONE_TEMPERATURE,
+        {vol.Required(ATTR_TEMPERATURE): vol.Coerce(float)},
+        "async_set_zone_temperature",
+    )
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(entity.entity_id for entity in entities)
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.CLIMATE] = old_entities
 
@@ -152,6 +175,19 @@ class InelsClimateDescription(ClimateEntityDescription):
     presets: list[str] | None = None
 
 
+@cache
+def _climate_description(key: str) -> InelsClimateDescription:
+    """Return the shared description of a climate type."""
+    type_dict = INELS_CLIMATE_TYPES[key]
+    return InelsClimateDescription(
+        key=key,
+        name=type_dict.name,
+        hvac_modes=type_dict.hvac_modes,
+        features=type_dict.features,
+        presets=type_dict.presets,
+    )
+
+
 class InelsClimate(InelsBaseEntity, ClimateEntity):
     """Inels Climate entity for HA."""
 
@@ -160,12 +196,19 @@ class InelsClimate(InelsBaseEntity, ClimateEntity):
     entity_description: InelsClimateDescription
 
     def __init__(
-        self, device: Device, key: str, index: int, description: InelsClimateDescription
+        self,
+        device: Device,
+        key: str,
+        index: int,
+        description: InelsClimateDescription,
+        zone_limiter: asyncio.Semaphore | None = None,
     ) -> None:
         """Initialize a climate entity."""
         super().__init__(device=device, key=key, index=index)
 
         self.entity_description = description
+        self._zone_limiter = zone_limiter or asyncio.Semaphore(1)
+        self._zone_echo: tuple[float, asyncio.Event] | None = None
 
         self._attr_max_temp = DEFAULT_MAX_TEMP
         self._attr_min_temp = DEFAULT_MIN_TEMP
@@ -175,9 +218,25 @@ class InelsClimate(InelsBaseEntity, ClimateEntity):
         self._attr_name = f"{self._attr_name} {description.name}"
         #self._attr_supported_features = description.features
 
+    def _callback(self) -> None:
+        """Get data from broker into the HA, confirm a pending zone setpoint."""
+        if (echo := self._zone_echo) is not None and self._has_target(echo[0]):
+            # runs in the mqtt thread
+            self.hass.loop.call_soon_threadsafe(echo[1].set)
+        super()._callback()
+
+    def _has_target(self, temperature: float) -> bool:
+        """Return if the device reports the given required temperature."""
+        target = self.target_temperature
+        return target is not None and math.isclose(
+            target, temperature, abs_tol=TEMPERATURE_TOLERANCE
+        )
+
     @property
     def current_temperature(self) -> float | None:
         """Get current temperature."""
+        if (last := self._last_state) is not None:
+            return last.attributes.get(ATTR_CURRENT_TEMPERATURE)
         return self._device.state.__dict__[self.key].current
 
     @property
@@ -192,6 +251,8 @@ class InelsClimate(InelsBaseEntity, ClimateEntity):
     @property
     def target_temperature(self) -> float | None:
         """Get target temperature."""
+        if (last := self._last_state) is not None:
+            return last.attributes.get(ATTR_TEMPERATURE)
         val = self._device.state.__dict__[self.key]
 
         if self.hvac_mode == HVACMode.COOL:
@@ -203,10 +264,14 @@ class InelsClimate(InelsBaseEntity, ClimateEntity):
     def target_temperature_high(self) -> float | None:
         # if self.
         # virt controller on two temp mode
+        if (last := self._last_state) is not None:
+            return last.attributes.get(ATTR_TARGET_TEMP_HIGH)
         return self._device.state.__dict__[self.key].required
 
     @property
     def target_temperature_low(self) -> float | None:
+        if (last := self._last_state) is not None:
+            return last.attributes.get(ATTR_TARGET_TEMP_LOW)
         return self._device.state.__dict__[self.key].required_cool
 
     @property
@@ -221,18 +286,24 @@ class InelsClimate(InelsBaseEntity, ClimateEntity):
 
     @property
     def hvac_mode(self) -> HVACMode | str | None:
+        if (last := self._last_state) is not None:
+            return last.state
         val = self._device.state.__dict__[self.key]
 
         return CLIMATE_MODE_TO_HVAC_MODE.get(val.climate_mode)
 
     @property
     def hvac_action(self) -> HVACAction | str | None:
+        if (last := self._last_state) is not None:
+            return last.attributes.get(ATTR_HVAC_ACTION)
         val = self._device.state.__dict__[self.key]
 
         return CLIMATE_ACTION_TO_HVAC_ACTION.get(val.current_action)
 
     @property
     def preset_mode(self) -> str | None:
+        if (last := self._last_state) is not None:
+            return last.attributes.get(ATTR_PRESET_MODE)
         val = self._device.state.__dict__[self.key]
 
         if hasattr(val, "current_preset") and val.control_mode == 0:  # user controlled
@@ -247,68 +318,104 @@ class InelsClimate(InelsBaseEntity, ClimateEntity):
             return self.entity_description.presets
         return None
 
+    def _temperature_change(self, temperature: float) -> InelsChange:
+        """Return the change of the required temperature of the current mode."""
+        if self.hvac_mode == HVACMode.COOL:
+            return InelsChange(self.key, -1, "required_cool", temperature)
+        return InelsChange(self.key, -1, "required", temperature)
+
     async def async_set_temperature(self, **kwargs) -> None:
         """Set the required temperature."""
-        ha_val = self._device.state
-        if hasattr(ha_val.__dict__[self.key], "control_mode"):
-            if ha_val.__dict__[self.key].control_mode != 0:
+        val = self._device.state.__dict__[self.key]
+        changes: list[InelsChange] = []
+        if hasattr(val, "control_mode"):
+            if val.control_mode != 0:
                 return None
 
             if ATTR_TEMPERATURE in kwargs:
-                if self.hvac_mode == HVACMode.COOL:
-                    ha_val.__dict__[self.key].required_cool = kwargs.get(
-                        ATTR_TEMPERATURE
-                    )
-                else:
-                    ha_val.__dict__[self.key].required = kwargs.get(ATTR_TEMPERATURE)
+                changes.append(self._temperature_change(kwargs[ATTR_TEMPERATURE]))
 
-            if hasattr(ha_val.__dict__[self.key], "current_preset"):
-                ha_val.__dict__[self.key].current_preset = 5  # manual mode
+            if hasattr(val, "current_preset"):
+                changes.append(
+                    InelsChange(self.key, -1, "current_preset", 5)  # manual mode
+                )
         else:
             if ATTR_TEMPERATURE in kwargs:
-                if self.hvac_mode == HVACMode.COOL:
-                    ha_val.__dict__[self.key].required_cool = kwargs.get(
-                        ATTR_TEMPERATURE
-                    )
-                else:
-                    ha_val.__dict__[self.key].required = kwargs.get(ATTR_TEMPERATURE)
+                changes.append(self._temperature_change(kwargs[ATTR_TEMPERATURE]))
+
+        await self._async_send(*changes)
 
-        await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+    async def async_set_zone_temperature(self, temperature: float) -> None:
+        """Set the required temperature as a part of a zone.
+
+        Called for all the entities of the zone at once, the publishes are
+        bounded by the shared limiter. Returns once the device reported the
+        new setpoint, or after a timeout.
+        """
+        val = self._device.state.__dict__[self.key]
+        if getattr(val, "control_mode", 0) != 0:
+            LOGGER.debug("%s is not user controlled, zone setpoint skipped", self.name)
+            return
+        if self._has_target(temperature):
+            return
+
+        echo = asyncio.Event()
+        self._zone_echo = (temperature, echo)
+        try:
+            async with self._zone_limiter:
+                await self.async_set_temperature(**{ATTR_TEMPERATURE: temperature})
+            async with asyncio.timeout(ZONE_ECHO_TIMEOUT):
+                await echo.wait()
+        except TimeoutError:
+            LOGGER.warning(
+                "%s did not confirm the required temperature %s", self.name, temperature
+            )
+        finally:
+            self._zone_echo = None
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
-        ha_val = self._device.state
+        val = self._device.state.__dict__[self.key]
+        changes: list[InelsChange] = []
 
-        if hasattr(ha_val.__dict__[self.key], "control_mode"):
-            ha_val.__dict__[self.key].climate_mode = HVAC_MODE_TO_CLIMATE_MODE[
-                hvac_mode
-            ]
+        if hasattr(val, "control_mode"):
+            changes.append(
+                InelsChange(
+                    self.key, -1, "climate_mode", HVAC_MODE_TO_CLIMATE_MODE[hvac_mode]
+                )
+            )
 
             last_val = self._device.last_values.ha_value
             if (
                 hvac_mode != HVACMode.OFF
-                and hasattr(ha_val.__dict__[self.key], "current_preset")
-                and ha_val.__dict__[self.key].current_preset == 0
+                and hasattr(val, "current_preset")
+                and val.current_preset == 0
             ):
-                ha_val.__dict__[self.key].required = last_val.__dict__[
-                    self.key
-                ].required
-                ha_val.__dict__[self.key].required_cool = last_val.__dict__[
-                    self.key
-                ].required_cool
+                changes.append(
+                    InelsChange(
+                        self.key, -1, "required", last_val.__dict__[self.key].required
+                    )
+                )
+                changes.append(
+                    InelsChange(
+                        self.key,
+                        -1,
+                        "required_cool",
+                        last_val.__dict__[self.key].required_cool,
+                    )
+                )
         else:
-            ha_val = self._device.state
             if hvac_mode == HVACMode.OFF:
-                ha_val.__dict__[self.key].required = 0
+                changes.append(InelsChange(self.key, -1, "required", 0))
             elif hvac_mode == HVACMode.HEAT:
-                ha_val.__dict__[self.key].required = (
-                    ha_val.__dict__[self.key].current + 2
+                changes.append(
+                    InelsChange(self.key, -1, "required", val.current + 2)
                 )
 
-        return await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+        await self._async_send(*changes)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
-        ha_val = self._device.state
         new_preset = self.entity_description.presets.index(preset_mode)
-        ha_val.__dict__[self.key].current_preset = new_preset
 
-        return await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+        await self._async_send(
+            InelsChange(self.key, -1, "current_preset", new_preset)
+        )
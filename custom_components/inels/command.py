@@ -0,0 +1,226 @@
+"""Copy-on-write commands for iNELS devices."""
+from __future__ import annotations
+
+import asyncio
+import copy
+import time
+from typing import Any, NamedTuple
+
+from inelsmqtt.devices import Device
+from inelsmqtt.util import DeviceValue, new_object
+
+from homeassistant.core import HomeAssistant
+
+from .const import COMMANDS, DOMAIN
+from .executor import InelsExecutor, get_executor
+from .metrics import InelsDeviceMetrics, get_metrics
+
+
+class InelsChange(NamedTuple):
+    """Change of a single value of a device state."""
+
+    key: str
+    index: int  # '-1' for no index
+    attr: str | None  # None replaces the whole value
+    value: Any
+
+
+def clone_ha_value(value: Any) -> Any:
+    """Return a private deep copy of a device HA value."""
+    if isinstance(value, type):
+        # HA values are anonymous classes (new_object), deepcopy keeps classes
+        return new_object(
+            **{
+                key: clone_ha_value(val)
+                for key, val in vars(value).items()
+                if not key.startswith("__")
+            }
+        )
+    if isinstance(value, list):
+        return [clone_ha_value(val) for val in value]
+    return copy.deepcopy(value)
+
+
+def apply_changes(value: Any, changes: list[InelsChange]) -> Any:
+    """Apply the changes onto a HA value."""
+    for change in changes:
+        if change.attr is None:
+            if change.index == -1:
+                setattr(value, change.key, change.value)
+            else:
+                getattr(value, change.key)[change.index] = change.value
+            continue
+
+        target = getattr(value, change.key)
+        if change.index != -1:
+            target = target[change.index]
+        setattr(target, change.attr, change.value)
+    return value
+
+
+def publish_changes(device: Device, changes: list[InelsChange]) -> bool:
+    """Publish the changes applied onto a copy of the device state.
+
+    The device state changes only with the next status of the device, the
+    published copy is not visible meanwhile. A device never reporting its
+    status takes the published value as its state, as set_ha_value does.
+    All the commands of the entities go through here, the profiler times it.
+    """
+    value = apply_changes(clone_ha_value(device.state), changes)
+    if device.mqtt.messages().get(device.state_topic) is None:
+        return device.set_ha_value(value)
+    if device.set_topic is None:
+        return False
+
+    payload = DeviceValue(
+        device.device_type,
+        device.inels_type,
+        ha_value=value,
+        last_value=device.state,
+    ).inels_set_value
+    return device.mqtt.publish(device.set_topic, payload)
+
+
+class InelsStagger:
+    """Space out the publishes of different devices.
+
+    Used for commands starting motors, so that a group of shutter modules
+    does not start all its motors at once. Each publish reserves the next
+    free slot, the first one waits only for the changes sent with it.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the stagger."""
+        self._interval = interval
+        self._next = 0.0
+
+    async def async_wait(self) -> None:
+        """Wait for the next free slot."""
+        now = time.monotonic()
+        start = max(now, self._next)
+        self._next = start + self._interval
+        # always yield, the commands of the same scene are merged meanwhile
+        await asyncio.sleep(start - now)
+
+
+class InelsCommandBuilder:
+    """Merge the changes sent to one device and publish them from a copy.
+
+    Changes arriving while a publish is in flight are merged, the last value
+    of a field wins, and published together right after it. A failed publish
+    leaves the device state untouched.
+    """
+
+    __slots__ = (
+        "_hass",
+        "_device",
+        "_executor",
+        "_metrics",
+        "_pending",
+        "_waiters",
+        "_task",
+        "_stagger",
+        "_publishing",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        device: Device,
+        executor: InelsExecutor,
+        metrics: InelsDeviceMetrics | None = None,
+    ) -> None:
+        """Initialize the command builder."""
+        self._hass = hass
+        self._device = device
+        self._executor = executor
+        self._metrics = metrics
+        self._pending: dict[tuple[str, int, str | None], InelsChange] = {}
+        self._waiters: list[asyncio.Future[bool]] = []
+        self._task: asyncio.Task[None] | None = None
+        self._stagger: InelsStagger | None = None
+        self._publishing = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of changes waiting to be published."""
+        return len(self._pending)
+
+    @property
+    def queued(self) -> int:
+        """Return the number of sends not completed yet, including in flight."""
+        return len(self._waiters) + self._publishing
+
+    async def async_send(
+        self, *changes: InelsChange, stagger: InelsStagger | None = None
+    ) -> bool:
+        """Send the changes, return if the publish was successful.
+
+        With a stagger the publish waits for its slot, changes sent meanwhile
+        are published together with them.
+        """
+        if not changes:
+            return True
+
+        if stagger is not None:
+            self._stagger = stagger
+        for change in changes:
+            self._pending[(change.key, change.index, change.attr)] = change
+
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        self._waiters.append(future)
+        if self._task is None:
+            self._task = self._hass.async_create_task(self._async_publish())
+
+        return await future
+
+    async def _async_publish(self) -> None:
+        """Publish the pending changes until there are none left."""
+        try:
+            while self._pending:
+                if (stagger := self._stagger) is not None:
+                    self._stagger = None
+                    await stagger.async_wait()
+
+                changes = list(self._pending.values())
+                waiters = self._waiters
+                self._pending = {}
+                self._waiters = []
+                self._publishing = len(waiters)
+
+                if self._metrics is not None:
+                    self._metrics.command_sent()
+                try:
+                    # looked up on each publish, the profiler swaps it
+                    result = await self._executor.async_run(
+                        publish_changes, self._device, changes
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(exc)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(result)
+                self._publishing = 0
+        finally:
+            self._publishing = 0
+            self._task = None
+
+
+def get_command_builder(
+    hass: HomeAssistant, entry_id: str, device: Device
+) -> InelsCommandBuilder:
+    """Return the command builder of a device, shared by all its entities."""
+    builders: dict[str, InelsCommandBuilder] = hass.data[DOMAIN][entry_id].setdefault(
+        COMMANDS, {}
+    )
+    if (builder := builders.get(device.unique_id)) is None:
+        builder = builders[device.unique_id] = InelsCommandBuilder(
+            hass,
+            device,
+            get_executor(hass, entry_id),
+            get_metrics(hass, entry_id).device(device.unique_id),
+        )
+    return builder
@@ -19,7 +19,20 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, TITLE
+from .const import (
+    CONF_DEBOUNCE_WINDOW,
+    CONF_LONG_PRESS_TIME,
+    CONF_MULTI_PRESS_WINDOW,
+    CONF_STATISTICS_WINDOW,
+    CONF_TRAVEL_CALIBRATION,
+    DEFAULT_DEBOUNCE_WINDOW,
+    DEFAULT_LONG_PRESS_TIME,
+    DEFAULT_MULTI_PRESS_WINDOW,
+    DEFAULT_STATISTICS_WINDOW,
+    DEFAULT_TRAVEL_CALIBRATION,
+    DOMAIN,
+    TITLE,
+)
 
 CONNECTION_TIMEOUT = 5
 
@@ -167,8 +180,56 @@ class InelsOptionsFlowHandler(config_entries.OptionsFlow):
         self.options = dict(config_entry.options)
 
     async def async_step_init(self, user_input: None = None) -> FlowResult:
-        """Manage the MQTT setup."""
-        return await self.async_step_setup()
+        """Choose between the MQTT setup and the integration tuning."""
+        return self.async_show_menu(step_id="init", menu_options=["setup", "tuning"])
+
+    async def async_step_tuning(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options of the integration."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=TITLE, data={**self.options, **user_input}
+            )
+
+        return self.async_show_form(
+            step_id="tuning",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_STATISTICS_WINDOW,
+                        default=self.options.get(
+                            CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                    vol.Required(
+                        CONF_TRAVEL_CALIBRATION,
+                        default=self.options.get(
+                            CONF_TRAVEL_CALIBRATION, DEFAULT_TRAVEL_CALIBRATION
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_MULTI_PRESS_WINDOW,
+                        default=self.options.get(
+                            CONF_MULTI_PRESS_WINDOW, DEFAULT_MULTI_PRESS_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=100, max=2000)),
+                    vol.Required(
+                        CONF_LONG_PRESS_TIME,
+                        default=self.options.get(
+                            CONF_LONG_PRESS_TIME, DEFAULT_LONG_PRESS_TIME
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=200, max=5000)),
+                    vol.Required(
+                        CONF_DEBOUNCE_WINDOW,
+                        default=self.options.get(
+                            CONF_DEBOUNCE_WINDOW, DEFAULT_DEBOUNCE_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
+                }
+            ),
+            last_step=True,
+        )
 
     async def async_step_setup(
         self, user_input: dict[str, Any] | None = None
@@ -196,6 +257,7 @@ class InelsOptionsFlowHandler(config_entries.OptionsFlow):
                 return self.async_create_entry(
                     title=TITLE,
                     data={
+                        **self.options,
                         CONF_HOST: user_input.get(CONF_HOST),
                         CONF_PORT: user_input.get(CONF_PORT),
                         CONF_USERNAME: user_input.get(CONF_USERNAME),
@@ -8,8 +8,27 @@ BROKER_CONFIG = "inels_mqtt_broker_config"
 BROKER = "inels_mqtt_broker"
 DEVICES = "devices"
 OLD_ENTITIES = "old_entities"
+COMMANDS = "commands"
+ACCESS = "access"
+METRICS = "metrics"
+HOT_PLUG = "hot_plug"
+EXECUTOR = "executor"
+OPTIONS = "options"
+PROFILER = f"{DOMAIN}_profiler"
 
 CONF_DISCOVERY_PREFIX = "discovery_prefix"
+CONF_STATISTICS_WINDOW = "statistics_window"
+CONF_TRAVEL_CALIBRATION = "travel_calibration"
+CONF_MULTI_PRESS_WINDOW = "multi_press_window"
+CONF_LONG_PRESS_TIME = "long_press_time"
+CONF_DEBOUNCE_WINDOW = "debounce_window"
+CONF_SUBTYPE = "subtype"
+
+DEFAULT_STATISTICS_WINDOW = 0  # samples, 0 disables the statistics sensors
+DEFAULT_TRAVEL_CALIBRATION = False
+DEFAULT_MULTI_PRESS_WINDOW = 400  # ms, between the presses of a multi-press
+DEFAULT_LONG_PRESS_TIME = 800  # ms, a button held longer is a long press
+DEFAULT_DEBOUNCE_WINDOW = 0  # ms, binary inputs must hold a new value this long
 
 TITLE = "iNELS"
 DESCRIPTION = ""
@@ -19,6 +38,18 @@ LOGGER = logging.getLogger(__package__)
 DEFAULT_MIN_TEMP = 10.0  # °C
 DEFAULT_MAX_TEMP = 50.0  # °C
 
+RAMP_STEP_INTERVAL = 0.5  # s, light transitions are stepped with this period
+SENSOR_ERROR_LOG_INTERVAL = 300  # s, a sensor logs a repeated error once per this
+ZONE_PARALLEL_COMMANDS = 16  # zone setpoints published at the same time
+ZONE_ECHO_TIMEOUT = 30  # s, wait for the devices to report the new setpoint
+TRAVEL_UPDATE_INTERVAL = 1  # s, position estimate of moving covers
+TRAVEL_SAVE_DELAY = 10  # s, cover positions and travel times are saved after
+TRAVEL_CALIBRATION_MIN_RATIO = 0.8  # shorter runs are not taken as full travel
+COVER_STAGGER_INTERVAL = 0.5  # s, between motor starts of different devices
+HEALTH_UPDATE_INTERVAL = 30  # s, sampling of the integration health sensors
+UNLOAD_TIMEOUT = 10  # s, for closing the broker session on unload
+IO_WORKERS = 4  # threads of the broker I/O executor of a config entry
+
 ICON_TEMPERATURE = "mdi:thermometer"
 ICON_BATTERY = "mdi:battery"
 ICON_SWITCH = "mdi:power-socket-eu"
@@ -51,6 +82,13 @@ ICON_FAN_3 = "mdi:fan-speed-3"
 ICON_ECO = "mdi:leaf"
 ICON_UP = "mdi:chevron-up"
 ICON_DOWN = "mdi:chevron-down"
+ICON_MESSAGE_IN = "mdi:message-arrow-left-outline"
+ICON_MESSAGE_OUT = "mdi:message-arrow-right-outline"
+ICON_QUEUE = "mdi:tray-full"
+ICON_TIMER = "mdi:timer-outline"
+ICON_LAN_DISCONNECT = "mdi:lan-disconnect"
+ICON_RECONNECT = "mdi:lan-pending"
+ICON_GAUGE = "mdi:gauge"
 
 ICON_WATER_HEATER_DICT = {
     "on": "mdi:valve-open",
@@ -66,6 +104,23 @@ ICON_THERMOSTAT = "mdi:home-thermometer-outline"
 
 MANUAL_SETUP = "manual"
 
+EVENT_ALERT = f"{DOMAIN}_alert"
+EVENT_BUTTON = f"{DOMAIN}_button"
+EVENT_CARD_ACCEPTED = f"{DOMAIN}_card_accepted"
+EVENT_CARD_REJECTED = f"{DOMAIN}_card_rejected"
+
+SIGNAL_NEW_DEVICE = f"{DOMAIN}_new_device_{{}}"  # entry ID
+
+ATTR_CARD_ID = "card_id"
+ATTR_RESTORED = "restored"
+
+SERVICE_SET_ZONE_TEMPERATURE = "set_zone_temperature"
+SERVICE_SET_TRAVEL_TIME = "set_travel_time"
+SERVICE_SET_DEBOUNCE = "set_debounce"
+SERVICE_ADD_CARD = "add_card"
+SERVICE_REMOVE_CARD = "remove_card"
+SERVICE_PROFILE = "profile"
+
 BUTTON_PRESS_STATE = "press"
 BUTTON_NO_ACTION_STATE = "no_action"
 
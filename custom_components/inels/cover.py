@@ -1,13 +1,17 @@
 """iNELS cover entity."""
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+from functools import cache
 from typing import Any
 
 from inelsmqtt.const import Shutter_state
 from inelsmqtt.devices import Device
+import voluptuous as vol
 
 from homeassistant.components.cover import (
+    ATTR_CURRENT_POSITION,
     ATTR_POSITION,
     CoverDeviceClass,
     CoverEntity,
@@ -15,22 +19,41 @@ from homeassistant.components.cover import (
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_CLOSED, Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
 from homeassistant.util import slugify
 
+from .command import InelsChange, InelsStagger
 from .entity import InelsBaseEntity
+from .hotplug import async_listen_new_devices
 from .const import (
+    CONF_TRAVEL_CALIBRATION,
+    COVER_STAGGER_INTERVAL,
+    DEFAULT_TRAVEL_CALIBRATION,
     DEVICES,
     DOMAIN,
     ICON_SHUTTER_CLOSED,
     ICON_SHUTTER_OPEN,
     OLD_ENTITIES,
+    SERVICE_SET_TRAVEL_TIME,
+    TRAVEL_UPDATE_INTERVAL,
 )
+from .travel import CLOSING, OPENING, InelsTravel, InelsTravelTracker, travel_store
 
+ATTR_OPEN_TIME = "open_time"
+ATTR_CLOSE_TIME = "close_time"
 
-@dataclass
+TRAVEL_TIME = vol.All(vol.Coerce(float), vol.Range(min=1, max=600))
+
+
+@dataclass(slots=True)
 class InelsShutterType:
     """Shutter type property description"""
 
@@ -40,13 +63,19 @@ class InelsShutterType:
 
 # SHUTTERS PLATFORM
 INELS_SHUTTERS_TYPES: dict[str, InelsShutterType] = {
-    "simple_shutters": InelsShutterType(  # no is_closed status
+    "simple_shutters": InelsShutterType(  # no is_closed status, position by travel time
         "Shutter",
-        CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP,
+        CoverEntityFeature.OPEN
+        | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.STOP
+        | CoverEntityFeature.SET_POSITION,
     ),
-    "shutters": InelsShutterType(
+    "shutters": InelsShutterType(  # position by travel time
         "Shutter",
-        CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP,
+        CoverEntityFeature.OPEN
+        | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.STOP
+        | CoverEntityFeature.SET_POSITION,
     ),
     "shutters_with_pos": InelsShutterType(
         "Shutter",
@@ -65,14 +94,25 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS cover from config entry."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.COVER)
 
-    items = INELS_SHUTTERS_TYPES.items()
-    entities: list[InelsBaseEntity] = []
-    for device in device_list:
-        for key, type_dict in items:
+    # position estimate of the covers without position status
+    travel_tracker = InelsTravelTracker(
+        hass,
+        travel_store(hass, config_entry.entry_id),
+        config_entry.options.get(CONF_TRAVEL_CALIBRATION, DEFAULT_TRAVEL_CALIBRATION),
+    )
+    await travel_tracker.async_load()
+    config_entry.async_on_unload(travel_tracker.async_shutdown)
+
+    # shared by all covers of the entry, motors of different devices start apart
+    stagger = InelsStagger(COVER_STAGGER_INTERVAL)
+
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        entities: list[InelsBaseEntity] = []
+        for key in INELS_SHUTTERS_TYPES:
             if hasattr(device.state, key):
                 if len(device.state.__dict__[key]) == 1:
                     entities.append(
@@ -80,34 +120,52 @@ async def async_setup_entry(
                             device=device,
                             key=key,
                             index=0,
-                            description=InelsCoverEntityDescription(
-                                key=key,
-                                name=str(type_dict.name),
-                                supported_features=type_dict.supported_features,
-                            ),
+                            description=_cover_description(key, -1),
+                            travel_tracker=travel_tracker,
+                            stagger=stagger,
                         )
                     )
                 else:
+                    members: list[InelsCover] = []
                     for k in range(len(device.state.__dict__[key])):
-                        entities.append(
+                        members.append(
                             InelsCover(
                                 device=device,
                                 key=key,
                                 index=k,
-                                description=InelsCoverEntityDescription(
-                                    key=f"{key}{k}",
-                                    name=f"{type_dict.name} {k+1}",
-                                    supported_features=type_dict.supported_features,
-                                ),
+                                description=_cover_description(key, k),
+                                travel_tracker=travel_tracker,
+                                stagger=stagger,
                             )
                         )
+                    entities.extend(members)
+                    entities.append(
+                        InelsCoverGroup(
+                            device=device,
+                            key=key,
+                            description=_cover_group_description(key),
+                            members=members,
+                            stagger=stagger,
+                        )
+                    )
+        return entities
 
+    entities = [entity for device in device_list for entity in device_entities(device)]
     async_add_entities(entities, False)
+    async_listen_new_devices(hass, config_entry, device_entities, async_add_entities)
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_TRAVEL_TIME,
+        {
+            vol.Required(ATTR_OPEN_TIME): TRAVEL_TIME,
+            vol.Optional(ATTR_CLOSE_TIME): TRAVEL_TIME,
+        },
+        "async_set_travel_time",
+    )
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(entity.entity_id for entity in entities)
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.COVER] = old_entities
 
@@ -119,6 +177,28 @@ class InelsCoverEntityDescription(CoverEntityDescription):
     supported_features: CoverEntityFeature | None = None
 
 
+@cache
+def _cover_description(key: str, index: int) -> InelsCoverEntityDescription:
+    """Return the shared description of a shutter, '-1' for single shutter."""
+    type_dict = INELS_SHUTTERS_TYPES[key]
+    return InelsCoverEntityDescription(
+        key=key if index == -1 else f"{key}{index}",
+        name=str(type_dict.name) if index == -1 else f"{type_dict.name} {index+1}",
+        supported_features=type_dict.supported_features,
+    )
+
+
+@cache
+def _cover_group_description(key: str) -> InelsCoverEntityDescription:
+    """Return the shared description of all shutters of a device."""
+    type_dict = INELS_SHUTTERS_TYPES[key]
+    return InelsCoverEntityDescription(
+        key=f"{key}_group",
+        name=f"{type_dict.name}s",
+        supported_features=type_dict.supported_features,
+    )
+
+
 class InelsCover(InelsBaseEntity, CoverEntity):
     """Cover class for Home Assistant."""
 
@@ -130,6 +210,8 @@ class InelsCover(InelsBaseEntity, CoverEntity):
         key: str,
         index: int,
         description: InelsCoverEntityDescription,
+        travel_tracker: InelsTravelTracker | None = None,
+        stagger: InelsStagger | None = None,
     ) -> None:
         """Initialize a cover entity."""
         super().__init__(device=device, key=key, index=index)
@@ -143,6 +225,102 @@ class InelsCover(InelsBaseEntity, CoverEntity):
 
         self._attr_supported_features = description.supported_features
 
+        channel = device.state.__dict__[key][index]
+        self._shutter_state: Shutter_state = channel.state
+        self._stop_requested = False
+        self._unsub_target_stop: CALLBACK_TYPE | None = None
+        self._travel_tracker = travel_tracker
+        self._stagger = stagger
+        self._travel: InelsTravel | None = None
+        if travel_tracker is not None and not hasattr(channel, "position"):
+            self._travel = travel_tracker.get(
+                self._attr_unique_id, reports_stop=key == "simple_shutters"
+            )
+            if self._travel.position is None and channel.is_closed:
+                self._travel.position = 0.0
+
+    async def _async_restore(self, state: State) -> None:
+        """Take the last state, a cover without position status estimates on."""
+        await super()._async_restore(state)
+        position = state.attributes.get(ATTR_CURRENT_POSITION)
+        if self._travel is not None and position is not None:
+            self._travel.position = float(position)
+
+    def _callback(self) -> None:
+        """Get data from broker into the HA, follow the movement of the cover."""
+        if self._travel is not None and self.hass is not None:
+            # runs in the mqtt thread
+            self.hass.loop.call_soon_threadsafe(
+                self._async_shutter_state,
+                self._device.state.__dict__[self.key][self.index].state,
+            )
+        super()._callback()
+
+    @callback
+    def _async_shutter_state(self, state: Shutter_state) -> None:
+        """Start or stop the travel estimate on a reported motor state."""
+        if state == self._shutter_state:
+            return
+        self._shutter_state = state
+
+        if state == Shutter_state.Open:
+            self._async_travel_start(OPENING)
+        elif state == Shutter_state.Closed:
+            self._async_travel_start(CLOSING)
+        else:
+            self._async_travel_stop(by_device=not self._stop_requested)
+
+    @callback
+    def _async_travel_start(self, direction: int) -> None:
+        """Estimate the position while moving in the direction."""
+        self._stop_requested = False
+        if self._travel_tracker.async_start(
+            self._attr_unique_id, direction, self._async_travel_update
+        ):
+            self._async_travel_update()
+
+    @callback
+    def _async_travel_stop(self, by_device: bool) -> None:
+        """Stop estimating the position."""
+        self._stop_requested = False
+        self._cancel_target_stop()
+        self._travel_tracker.async_stop(self._attr_unique_id, by_device)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_travel_update(self) -> None:
+        """Write the estimated position, stop the cover at its target."""
+        travel = self._travel
+        if travel.target is not None and travel.moving:
+            eta = travel.time_to(travel.target)
+            if eta is not None and eta < TRAVEL_UPDATE_INTERVAL:
+                target = travel.target
+                travel.target = None
+                if target not in (0, 100):  # the end-stops stop the motor
+                    self._cancel_target_stop()
+                    self._unsub_target_stop = async_call_later(
+                        self.hass, eta, self._async_stop_at_target
+                    )
+        self.async_write_ha_state()
+
+    async def _async_stop_at_target(self, _now: Any) -> None:
+        """Stop the cover that reached the required position."""
+        self._unsub_target_stop = None
+        await self.async_stop_cover()
+
+    @callback
+    def _cancel_target_stop(self) -> None:
+        if self._unsub_target_stop is not None:
+            self._unsub_target_stop()
+            self._unsub_target_stop = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop following the movement of the cover."""
+        self._cancel_target_stop()
+        if self._travel is not None:
+            self._travel_tracker.async_stop(self._attr_unique_id, by_device=False)
+        await super().async_will_remove_from_hass()
+
     @property
     def icon(self) -> str | None:
         """Cover icon."""
@@ -156,41 +334,236 @@ class InelsCover(InelsBaseEntity, CoverEntity):
         #     == Shutter_state.Closed
         # )
         # return is_closed
+        if self._travel is not None and self._travel.position is not None:
+            return self._travel.position == 0
+        if (last := self._last_state) is not None:
+            return last.state == STATE_CLOSED
         return self._device.state.__dict__[self.key][self.index].is_closed
 
+    @property
+    def is_opening(self) -> bool | None:
+        """Cover is opening, known only from the travel estimate."""
+        if self._travel is not None:
+            return self._travel.direction == OPENING
+        return super().is_opening
+
+    @property
+    def is_closing(self) -> bool | None:
+        """Cover is closing, known only from the travel estimate."""
+        if self._travel is not None:
+            return self._travel.direction == CLOSING
+        return super().is_closing
+
     @property
     def current_cover_position(self) -> int | None:
         """Return current cover position."""
+        if (last := self._last_state) is not None and self._travel is None:
+            return last.attributes.get(ATTR_CURRENT_POSITION)
         if hasattr(self._device.state.__dict__[self.key][self.index], "position"):
             return self._device.state.__dict__[self.key][self.index].position
+        if self._travel is not None and self._travel.position is not None:
+            return round(self._travel.position)
         return super().current_cover_position
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Set cover position."""
+        position: int = kwargs[ATTR_POSITION]
         if hasattr(self._device.state.__dict__[self.key][self.index], "position"):
-            ha_val = self._device.state
-            ha_val.__dict__[self.key][self.index].position = kwargs[ATTR_POSITION]
-            ha_val.__dict__[self.key][self.index].set_pos = True
-            await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+            await self._async_send(
+                InelsChange(self.key, self.index, "position", position),
+                InelsChange(self.key, self.index, "set_pos", True),
+            )
+            return
+
+        travel = self._travel
+        if travel is None or not travel.known:
+            raise HomeAssistantError(
+                f"Position of {self.name} is not known, set its travel time first"
+            )
+        if position == round(travel.position):
             return
-        return super().set_cover_position(**kwargs)
+
+        travel.target = position
+        await self._async_move(
+            Shutter_state.Open if position > travel.position else Shutter_state.Closed,
+            keep_target=True,
+        )
+
+    async def async_set_travel_time(
+        self, open_time: float, close_time: float | None = None
+    ) -> None:
+        """Set the time the cover needs to open and close fully."""
+        if self._travel is None:
+            raise HomeAssistantError(f"{self.name} reports its position")
+        self._travel_tracker.async_set_travel_time(
+            self._attr_unique_id,
+            open_time,
+            open_time if close_time is None else close_time,
+        )
+        self.async_write_ha_state()
+
+    async def _async_move(
+        self, state: Shutter_state, keep_target: bool = False
+    ) -> None:
+        """Start the motor in the direction of the state."""
+        change = self.move_change(state, keep_target)
+        if await self._async_send(change, stagger=self._stagger):
+            self.async_moved(state)
+
+    @callback
+    def move_change(
+        self, state: Shutter_state, keep_target: bool = False
+    ) -> InelsChange:
+        """Return the change starting the motor, drop the pending target stop."""
+        self._cancel_target_stop()
+        if self._travel is not None and not keep_target:
+            self._travel.target = None
+        return InelsChange(self.key, self.index, "state", state)
+
+    @callback
+    def async_moved(self, state: Shutter_state) -> None:
+        """Follow the movement started by a command."""
+        if self._travel is not None:
+            self._async_travel_start(
+                OPENING if state == Shutter_state.Open else CLOSING
+            )
+
+    @callback
+    def stop_change(self) -> InelsChange:
+        """Return the change stopping the motor."""
+        self._stop_requested = True
+        return InelsChange(
+            self.key,
+            self.index,
+            "state",
+            Shutter_state.Stop_up if self.is_closed else Shutter_state.Stop_down,
+        )
+
+    @callback
+    def async_stopped(self) -> None:
+        """Follow the stop sent by a command."""
+        if self._travel is not None:
+            self._async_travel_stop(by_device=False)
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open cover."""
-        ha_val = self._device.state
-        ha_val.__dict__[self.key][self.index].state = Shutter_state.Open
-        await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+        await self._async_move(Shutter_state.Open)
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close cover."""
-        ha_val = self._device.state
-        ha_val.__dict__[self.key][self.index].state = Shutter_state.Closed
-        await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+        await self._async_move(Shutter_state.Closed)
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop cover."""
-        ha_val = self._device.state
-        ha_val.__dict__[self.key][self.index].state = (
-            Shutter_state.Stop_up if self.is_closed else Shutter_state.Stop_down
+        await self._async_send(self.stop_change())
+        self.async_stopped()
+
+
+class InelsCoverGroup(InelsBaseEntity, CoverEntity):
+    """All the shutters of a multi-channel device as one cover.
+
+    Commands of the group are written to the device at once, instead of one
+    write per channel.
+    """
+
+    entity_description: InelsCoverEntityDescription
+
+    def __init__(
+        self,
+        device: Device,
+        key: str,
+        description: InelsCoverEntityDescription,
+        members: list[InelsCover],
+        stagger: InelsStagger | None = None,
+    ) -> None:
+        """Initialize a cover group entity."""
+        super().__init__(device=device, key=key, index=0)
+        self.entity_description = description
+        self._members = members
+        self._stagger = stagger
+
+        self._attr_device_class = CoverDeviceClass.SHUTTER
+
+        self._attr_unique_id = slugify(f"{self._attr_unique_id}_{description.key}")
+        self.entity_id = f"{Platform.COVER}.{self._attr_unique_id}"
+        self._attr_name = f"{self._attr_name} {description.name}"
+
+        self._attr_supported_features = description.supported_features
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the states of the member covers."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass,
+                [member.entity_id for member in self._members],
+                self._async_member_changed,
+            )
+        )
+
+    @callback
+    def _async_member_changed(self, _event: Any) -> None:
+        """Update the group with its members, travel estimates included."""
+        self.async_write_ha_state()
+
+    @property
+    def icon(self) -> str | None:
+        """Cover icon."""
+        return ICON_SHUTTER_CLOSED if self.is_closed is True else ICON_SHUTTER_OPEN
+
+    @property
+    def is_closed(self) -> bool | None:
+        """Closed when all the members are closed."""
+        closed = [member.is_closed for member in self._members]
+        if False in closed:
+            return False
+        if None in closed:
+            return None
+        return True
+
+    @property
+    def is_opening(self) -> bool | None:
+        """Opening when any of the members is opening."""
+        return any(member.is_opening for member in self._members)
+
+    @property
+    def is_closing(self) -> bool | None:
+        """Closing when any of the members is closing."""
+        return any(member.is_closing for member in self._members)
+
+    @property
+    def current_cover_position(self) -> int | None:
+        """Return the average position of the members."""
+        positions = [member.current_cover_position for member in self._members]
+        if None in positions:
+            return None
+        return round(sum(positions) / len(positions))
+
+    async def async_set_cover_position(self, **kwargs: Any) -> None:
+        """Set the position of all the members, merged into one write."""
+        await asyncio.gather(
+            *(member.async_set_cover_position(**kwargs) for member in self._members)
         )
-        await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+
+    async def _async_move(self, state: Shutter_state) -> None:
+        """Start the motors of all the members in one write."""
+        if await self._async_send(
+            *(member.move_change(state) for member in self._members),
+            stagger=self._stagger,
+        ):
+            for member in self._members:
+                member.async_moved(state)
+
+    async def async_open_cover(self, **kwargs: Any) -> None:
+        """Open all the shutters."""
+        await self._async_move(Shutter_state.Open)
+
+    async def async_close_cover(self, **kwargs: Any) -> None:
+        """Close all the shutters."""
+        await self._async_move(Shutter_state.Closed)
+
+    async def async_stop_cover(self, **kwargs: Any) -> None:
+        """Stop all the shutters."""
+        await self._async_send(*(member.stop_change() for member in self._members))
+        for member in self._members:
+            member.async_stopped()
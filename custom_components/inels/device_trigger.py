@@ -0,0 +1,90 @@
+"""Device triggers of iNELS buttons."""
+from __future__ import annotations
+
+from inelsmqtt.devices import Device
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import (
+    ATTR_DEVICE_ID,
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_EVENT,
+    CONF_PLATFORM,
+    CONF_TYPE,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .button import button_channels
+from .const import CONF_SUBTYPE, DEVICES, DOMAIN, EVENT_BUTTON
+from .event import EVENT_TYPES
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(EVENT_TYPES),
+        vol.Required(CONF_SUBTYPE): str,
+    }
+)
+
+
+def _get_device(hass: HomeAssistant, device_id: str) -> Device | None:
+    """Return the iNELS device of a device registry entry."""
+    if (entry := dr.async_get(hass).async_get(device_id)) is None:
+        return None
+
+    unique_ids = {ident for domain, ident in entry.identifiers if domain == DOMAIN}
+    for entry_id in entry.config_entries:
+        inels_data = hass.data.get(DOMAIN, {}).get(entry_id)
+        if not inels_data or DEVICES not in inels_data:
+            continue
+        for device in inels_data[DEVICES]:
+            if device.unique_id in unique_ids:
+                return device
+    return None
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, str]]:
+    """List the button triggers of an iNELS device."""
+    if (device := _get_device(hass, device_id)) is None:
+        return []
+
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DEVICE_ID: device_id,
+            CONF_DOMAIN: DOMAIN,
+            CONF_TYPE: event_type,
+            CONF_SUBTYPE: description.key,
+        }
+        for _key, _index, description in button_channels(device)
+        for event_type in EVENT_TYPES
+    ]
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger to the button events fired by the event entities."""
+    event_config = event_trigger.TRIGGER_SCHEMA(
+        {
+            event_trigger.CONF_PLATFORM: CONF_EVENT,
+            event_trigger.CONF_EVENT_TYPE: EVENT_BUTTON,
+            event_trigger.CONF_EVENT_DATA: {
+                ATTR_DEVICE_ID: config[CONF_DEVICE_ID],
+                CONF_TYPE: config[CONF_TYPE],
+                CONF_SUBTYPE: config[CONF_SUBTYPE],
+            },
+        }
+    )
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
@@ -0,0 +1,73 @@
+"""Diagnostics support for iNELS."""
+from __future__ import annotations
+
+from typing import Any
+
+from inelsmqtt.devices import Device
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import DEVICES, DOMAIN
+from .executor import get_executor
+from .metrics import get_metrics
+from .profiler import get_profiler
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+def _device_diagnostics(device: Device, metrics: dict[str, Any]) -> dict[str, Any]:
+    """Return the diagnostics of one device."""
+    return {
+        "unique_id": device.unique_id,
+        "title": device.title,
+        "inels_type": device.inels_type,
+        "state_topic": device.state_topic,
+        "metrics": metrics,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry."""
+    devices: list[Device] = hass.data[DOMAIN][entry.entry_id][DEVICES]
+    metrics = get_metrics(hass, entry.entry_id)
+    profiler = get_profiler(hass)
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "devices": [
+            _device_diagnostics(device, metrics.device(device.unique_id).as_dict())
+            for device in devices
+        ],
+        "executor": get_executor(hass, entry.entry_id).as_dict(),
+        "profiler": {
+            **profiler.as_dict(),
+            "memory": await profiler.async_memory(hass),
+        },
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device_entry: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a device."""
+    devices: list[Device] = hass.data[DOMAIN][entry.entry_id][DEVICES]
+    metrics = get_metrics(hass, entry.entry_id)
+    unique_ids = {
+        ident for domain, ident in device_entry.identifiers if domain == DOMAIN
+    }
+
+    for device in devices:
+        if device.unique_id in unique_ids:
+            return _device_diagnostics(
+                device, metrics.device(device.unique_id).as_dict()
+            )
+    return {}
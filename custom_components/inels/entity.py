@@ -1,15 +1,114 @@
 """Base class for iNELS components."""
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from inelsmqtt.const import DEVICE_CONNECTED
 from inelsmqtt.devices import Device
 
-from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import State
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from .command import InelsChange, InelsStagger, get_command_builder
+from .const import ATTR_RESTORED, DOMAIN, LOGGER
+from .executor import get_executor
+from .metrics import get_metrics
+
+# device info is identical for all entities of a device, build it only once
+_DEVICE_INFO: WeakKeyDictionary[Device, DeviceInfo] = WeakKeyDictionary()
+
+
+# a device keeps only one callback per (key, index), several entities can share it
+_DEVICE_CALLBACKS: WeakKeyDictionary[
+    Device, dict[tuple[str, int], list[Callable[[], None]]]
+] = WeakKeyDictionary()
+
+
+# set while the profiler runs, wraps the entity callbacks of the fan-out
+_callback_wrapper: Callable[[Callable[[], None]], Callable[[], None]] | None = None
+
+
+def _dispatch(
+    callbacks: dict[tuple[str, int], list[Callable[[], None]]],
+    channel: tuple[str, int],
+) -> None:
+    """Call all the entity callbacks of a device channel."""
+    for fnc in callbacks[channel]:
+        fnc()
+
+
+def _unwrap(fnc: Callable[[], None]) -> Callable[[], None]:
+    """Return the entity callback under a profiler wrapper."""
+    return getattr(fnc, "inels_original", fnc)
+
 
-from .const import DOMAIN, LOGGER
+def add_device_callback(
+    device: Device, key: str, index: int, fnc: Callable[[], None]
+) -> Callable[[], None]:
+    """Register an entity callback of a device channel, return its remover."""
+    callbacks = _DEVICE_CALLBACKS.setdefault(device, {})
+    channel = (key, index)
+    if channel not in callbacks:
+        callbacks[channel] = []
+        device.add_ha_callback(key, index, partial(_dispatch, callbacks, channel))
 
+    # lists are replaced, not mutated, as the dispatch runs in the mqtt thread
+    wrapped = fnc if _callback_wrapper is None else _callback_wrapper(fnc)
+    callbacks[channel] = [*callbacks[channel], wrapped]
+
+    def remove_callback() -> None:
+        callbacks[channel] = [cb for cb in callbacks[channel] if _unwrap(cb) is not fnc]
+
+    return remove_callback
+
+
+def set_callback_wrapper(
+    wrapper: Callable[[Callable[[], None]], Callable[[], None]] | None
+) -> None:
+    """Wrap the registered and future entity callbacks, None unwraps them."""
+    global _callback_wrapper  # pylint: disable=global-statement
+    _callback_wrapper = wrapper
+
+    for callbacks in _DEVICE_CALLBACKS.values():
+        for channel, fncs in callbacks.items():
+            originals = [_unwrap(fnc) for fnc in fncs]
+            callbacks[channel] = (
+                originals if wrapper is None else [wrapper(fnc) for fnc in originals]
+            )
+
+
+def get_device_info(device: Device) -> DeviceInfo:
+    """Return the shared device info of a device."""
+    if (device_info := _DEVICE_INFO.get(device)) is None:
+        info = device.info()
+        device_info = DeviceInfo(
+            identifiers={(DOMAIN, device.unique_id)},
+            manufacturer=info.manufacturer,
+            model=info.model_number,
+            name=device.title,
+            sw_version=info.sw_version,
+            via_device=(DOMAIN, device.parent_id),
+        )
+        _DEVICE_INFO[device] = device_info
+    return device_info
 
-class InelsBaseEntity(Entity):
-    """Base Inels device."""
+
+class InelsBaseEntity(RestoreEntity):
+    """Base Inels device.
+
+    Until the broker delivers a status of the device, the entity shows its
+    state from before the restart, marked by the restored attribute. The
+    entities are added after the discovery, which already collected the
+    retained statuses, so only devices connected without one are restored.
+    """
+
+    _restores_state = True
+    _restored: State | None = None
 
     def __init__(
         self,
@@ -28,18 +127,88 @@ class InelsBaseEntity(Entity):
         self._key = key
         self._index = index
 
-        self._device.add_ha_callback(self.key, self.index, self._callback)
-
     async def async_added_to_hass(self) -> None:
-        """Add subscription of the data listener."""
+        """Add subscription of the data listener.
+
+        Disabled entities are never added, so they get no callback and cost
+        nothing per message. Enabling one reloads the entry, which adds it.
+        """
+        self.async_on_remove(
+            add_device_callback(self._device, self.key, self.index, self._callback)
+        )
+        metrics = get_metrics(self.hass, self.platform.config_entry.entry_id).device(
+            self._device.unique_id
+        )
+        metrics.subscriptions += 1
         self._device.mqtt.subscribe_listener(
-            self._device.state_topic, self._device.unique_id, self._device.callback
+            self._device.state_topic,
+            self._device.unique_id,
+            metrics.metered_callback(self._device),
         )
 
+        def remove_subscription() -> None:
+            metrics.subscriptions -= 1
+
+        self.async_on_remove(remove_subscription)
+
         self.async_on_remove(lambda: LOGGER.info("Entity %s to be removed", self.name))
 
+        if (
+            self._restores_state
+            and not self._has_status()
+            and (state := await self.async_get_last_state()) is not None
+            and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+        ):
+            await self._async_restore(state)
+
+    async def _async_restore(self, state: State) -> None:
+        """Take the last state, the platforms read their values from it."""
+        self._restored = state
+
+    def _has_status(self) -> bool:
+        """Return if the broker delivered a status of the device.
+
+        The discovery lists the devices announced only by their connected
+        topic with no status payload.
+        """
+        return self._device.mqtt.messages().get(self._device.state_topic) is not None
+
+    def _reported_connected(self) -> bool | None:
+        """Return the last connected report of the device, None before any."""
+        # the library has no accessor of the connected topic
+        val = self._device.mqtt.messages().get(
+            self._device._Device__connected_topic  # pylint: disable=protected-access
+        )
+        if isinstance(val, (bytes, bytearray)):
+            val = val.decode()
+        return DEVICE_CONNECTED.get(val)
+
+    @property
+    def _last_state(self) -> State | None:
+        """Return the restored state until the device reports its status."""
+        if self._restored is not None and self._has_status():
+            self._restored = None
+        return self._restored
+
+    async def _async_send(
+        self, *changes: InelsChange, stagger: InelsStagger | None = None
+    ) -> bool:
+        """Send changes of the device state as a single command."""
+        builder = get_command_builder(
+            self.hass, self.platform.config_entry.entry_id, self._device
+        )
+        self._restored = None
+        return await builder.async_send(*changes, stagger=stagger)
+
+    async def _async_set_ha_value(self, ha_val: Any) -> bool:
+        """Publish a new state of the device, it replaces the restored one."""
+        self._restored = None
+        executor = get_executor(self.hass, self.platform.config_entry.entry_id)
+        return await executor.async_run(self._device.set_ha_value, ha_val)
+
     def _callback(self) -> None:
         """Get data from broker into the HA."""
+        self._restored = None
         self.schedule_update_ha_state()
 
     @property
@@ -50,22 +219,22 @@ class InelsBaseEntity(Entity):
     @property
     def device_info(self) -> DeviceInfo:
         """Return device info."""
-        info = self._device.info()
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device.unique_id)},
-            manufacturer=info.manufacturer,
-            model=info.model_number,
-            name=self._device.title,
-            sw_version=info.sw_version,
-            via_device=(DOMAIN, self._parent_id),
-        )
+        return get_device_info(self._device)
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-
+        """Return if entity is available, restored unless reported disconnected."""
+        if self._last_state is not None and self._reported_connected() is not False:
+            return True
         return self._device.is_available and super().available
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark a restored state, it is not confirmed by the device yet."""
+        if self._last_state is not None:
+            return {ATTR_RESTORED: True}
+        return None
+
     @property
     def key(self) -> str:
         """Return the referenced variable to read from."""
@@ -0,0 +1,182 @@
+"""iNELS event entity."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+
+from inelsmqtt.devices import Device
+
+from homeassistant.components.event import (
+    EventDeviceClass,
+    EventEntity,
+    EventEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID, CONF_TYPE, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import slugify
+
+from .button import button_channels, is_pressed, is_released
+from .entity import InelsBaseEntity
+from .hotplug import async_listen_new_devices
+from .const import (
+    CONF_LONG_PRESS_TIME,
+    CONF_MULTI_PRESS_WINDOW,
+    CONF_SUBTYPE,
+    DEFAULT_LONG_PRESS_TIME,
+    DEFAULT_MULTI_PRESS_WINDOW,
+    DEVICES,
+    DOMAIN,
+    EVENT_BUTTON,
+    LOGGER,
+    OLD_ENTITIES,
+)
+from .gesture import GESTURES, InelsGestureEngine
+
+EVENT_PRESS = "press"
+EVENT_RELEASE = "release"
+
+EVENT_TYPES = [EVENT_PRESS, EVENT_RELEASE, *GESTURES]
+
+
+@dataclass
+class InelsEventDescription(EventEntityDescription):
+    """Class for description inels event entities."""
+
+
+@cache
+def _event_description(key: str, name: str, icon: str) -> InelsEventDescription:
+    """Return the shared description of the events of a button."""
+    return InelsEventDescription(
+        key=key,
+        name=name,
+        icon=icon,
+        device_class=EventDeviceClass.BUTTON,
+        event_types=EVENT_TYPES,
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Load iNELS button events from config entry."""
+    device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
+        OLD_ENTITIES
+    ].get(Platform.EVENT)
+
+    # one scheduler for the gestures of all the buttons, windows are in ms
+    gestures = InelsGestureEngine(
+        hass,
+        multi_press_window=config_entry.options.get(
+            CONF_MULTI_PRESS_WINDOW, DEFAULT_MULTI_PRESS_WINDOW
+        )
+        / 1000,
+        long_press_time=config_entry.options.get(
+            CONF_LONG_PRESS_TIME, DEFAULT_LONG_PRESS_TIME
+        )
+        / 1000,
+    )
+    config_entry.async_on_unload(gestures.async_shutdown)
+
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        return [
+            InelsButtonEvent(
+                device=device,
+                key=key,
+                index=k,
+                description=_event_description(button.key, button.name, button.icon),
+                gestures=gestures,
+            )
+            for key, k, button in button_channels(device)
+        ]
+
+    entities = [entity for device in device_list for entity in device_entities(device)]
+    async_add_entities(entities)
+    async_listen_new_devices(hass, config_entry, device_entities, async_add_entities)
+
+    if old_entities:
+        old_entities.difference_update(entity.entity_id for entity in entities)
+
+    hass.data[DOMAIN][config_entry.entry_id][Platform.EVENT] = old_entities
+
+
+class InelsButtonEvent(InelsBaseEntity, EventEntity):
+    """Physical presses and gestures of a button, also fired for the device triggers."""
+
+    entity_description: InelsEventDescription
+    _restores_state = False  # the last event is restored by the event itself
+
+    def __init__(
+        self,
+        device: Device,
+        key: str,
+        index: int,
+        description: InelsEventDescription,
+        gestures: InelsGestureEngine,
+    ) -> None:
+        """Initialize button events."""
+        super().__init__(device=device, key=key, index=index)
+        self.entity_description = description
+        self._gesture = gestures.add_key(self._async_fire)
+
+        self._attr_unique_id = slugify(f"{self._attr_unique_id}_{description.key}")
+        self.entity_id = f"{Platform.EVENT}.{self._attr_unique_id}"
+        if description.name:
+            self._attr_name = f"{self._attr_name} {description.name}"
+
+    @property
+    def available(self) -> bool:
+        # a press is delivered whenever the device reports it
+        return True
+
+    def _callback(self) -> None:
+        """Hand the presses from the device status over to the loop."""
+        if self.hass is None:
+            return
+        # runs in the mqtt thread, the loop clock is thread safe
+        if is_pressed(self._device, self.key, self.index):
+            self.hass.loop.call_soon_threadsafe(
+                self._async_edge, True, self.hass.loop.time()
+            )
+        elif is_released(self._device, self.key, self.index):
+            self.hass.loop.call_soon_threadsafe(
+                self._async_edge, False, self.hass.loop.time()
+            )
+
+    @callback
+    def _async_edge(self, pressed: bool, received: float) -> None:
+        """Fire the press or release and feed the gesture state machine."""
+        if pressed:
+            self._async_fire(EVENT_PRESS, received)
+            self._gesture.press(received)
+        else:
+            self._async_fire(EVENT_RELEASE, received)
+            self._gesture.release(received)
+
+    @callback
+    def _async_fire(self, event_type: str, received: float) -> None:
+        """Fire the event on the entity and for the device triggers."""
+        self._trigger_event(event_type)
+        self.async_write_ha_state()
+
+        if self.registry_entry is not None and self.registry_entry.device_id:
+            self.hass.bus.async_fire(
+                EVENT_BUTTON,
+                {
+                    ATTR_DEVICE_ID: self.registry_entry.device_id,
+                    ATTR_ENTITY_ID: self.entity_id,
+                    CONF_TYPE: event_type,
+                    CONF_SUBTYPE: self.entity_description.key,
+                },
+            )
+
+        LOGGER.debug(
+            "%s of %s delivered in %.2f ms",
+            event_type,
+            self.entity_id,
+            (self.hass.loop.time() - received) * 1000,
+        )
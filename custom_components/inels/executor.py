@@ -0,0 +1,115 @@
+"""Executor of the blocking broker I/O of an iNELS config entry."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, EXECUTOR, IO_WORKERS
+
+_T = TypeVar("_T")
+
+
+class InelsExecutor:
+    """Run the blocking broker I/O of a config entry on a few threads of its own.
+
+    Publishes, the discovery and the management of the broker session queue
+    up here, a large scene does not occupy the executor shared by all the
+    integrations. The counters are read by the health sensors.
+    """
+
+    __slots__ = (
+        "_hass",
+        "_pool",
+        "_lock",
+        "_running",
+        "_run_time",
+        "workers",
+        "queued",
+    )
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, workers: int = IO_WORKERS
+    ) -> None:
+        """Initialize the executor."""
+        self._hass = hass
+        self._pool = ThreadPoolExecutor(
+            workers, thread_name_prefix=f"{DOMAIN}_{entry_id}"
+        )
+        self._lock = threading.Lock()
+        self._running: dict[int, float] = {}  # start time of the job by thread
+        self._run_time = 0.0  # s, of the finished jobs
+        self.workers = workers
+        self.queued = 0  # jobs waiting for a thread
+
+    @property
+    def busy(self) -> int:
+        """Return the number of jobs running."""
+        return len(self._running)
+
+    @property
+    def busy_time(self) -> float:
+        """Return the time run by all the threads so far, in s.
+
+        The jobs still running count up to now, a long one such as the
+        discovery shows in every sample it spans, not only in the last one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return self._run_time + sum(
+                now - started for started in self._running.values()
+            )
+
+    async def async_run(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run the target in the executor, return its result."""
+        with self._lock:
+            self.queued += 1
+        try:
+            future = self._pool.submit(self._run, target, args)
+        except RuntimeError:  # shut down
+            with self._lock:
+                self.queued -= 1
+            raise
+        future.add_done_callback(self._dropped)
+        return await asyncio.wrap_future(future, loop=self._hass.loop)
+
+    def _dropped(self, future: Future[Any]) -> None:
+        """Uncount a job cancelled before it started, e.g. by the shutdown."""
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def _run(self, target: Callable[..., _T], args: tuple[Any, ...]) -> _T:
+        """Run the target, runs in a thread of the executor."""
+        thread = threading.get_ident()
+        with self._lock:
+            self.queued -= 1
+            self._running[thread] = time.monotonic()
+        try:
+            return target(*args)
+        finally:
+            with self._lock:
+                self._run_time += time.monotonic() - self._running.pop(thread)
+
+    def shutdown(self) -> None:
+        """Stop the threads, the jobs not started yet are dropped."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for the diagnostics."""
+        return {
+            "workers": self.workers,
+            "queued": self.queued,
+            "busy": self.busy,
+            "busy_time": round(self.busy_time, 3),
+        }
+
+
+def get_executor(hass: HomeAssistant, entry_id: str) -> InelsExecutor:
+    """Return the executor of a config entry."""
+    return hass.data[DOMAIN][entry_id][EXECUTOR]
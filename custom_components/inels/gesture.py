@@ -0,0 +1,150 @@
+"""Multi-press and long-press gestures of iNELS buttons."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import heapq
+import itertools
+
+from homeassistant.core import HomeAssistant, callback
+
+GESTURE_SINGLE = "single"
+GESTURE_DOUBLE = "double"
+GESTURE_TRIPLE = "triple"
+GESTURE_LONG_PRESS = "long_press"
+GESTURE_LONG_RELEASE = "long_release"
+
+GESTURES = [
+    GESTURE_SINGLE,
+    GESTURE_DOUBLE,
+    GESTURE_TRIPLE,
+    GESTURE_LONG_PRESS,
+    GESTURE_LONG_RELEASE,
+]
+
+MULTI_PRESS = {1: GESTURE_SINGLE, 2: GESTURE_DOUBLE, 3: GESTURE_TRIPLE}
+
+
+class InelsGestureKey:
+    """Gesture state machine of one button.
+
+    A press waits for the long press time, a short release waits for the
+    multi-press window. When nothing else happens meanwhile, the pending
+    gesture is emitted by the engine. Times are in the clock of the loop.
+    """
+
+    __slots__ = ("_engine", "_emit", "_pressed", "_long", "_count", "_generation")
+
+    def __init__(
+        self, engine: InelsGestureEngine, emit: Callable[[str, float], None]
+    ) -> None:
+        """Initialize the key."""
+        self._engine = engine
+        self._emit = emit
+        self._pressed = False
+        self._long = False
+        self._count = 0
+        self._generation = 0
+
+    def press(self, now: float) -> None:
+        """Handle the press of the button."""
+        self._pressed = True
+        self._long = False
+        self._count += 1
+        self._schedule(now + self._engine.long_press_time)
+
+    def release(self, now: float) -> None:
+        """Handle the release of the button."""
+        if not self._pressed:
+            return
+        self._pressed = False
+
+        if self._long:
+            self._reset()
+            self._emit(GESTURE_LONG_RELEASE, now)
+        elif self._count >= len(MULTI_PRESS):
+            # nothing longer to wait for
+            self._reset()
+            self._emit(MULTI_PRESS[len(MULTI_PRESS)], now)
+        else:
+            self._schedule(now + self._engine.multi_press_window)
+
+    def expire(self, generation: int, now: float) -> None:
+        """Emit the pending gesture, called by the engine at its deadline."""
+        if generation != self._generation:
+            return  # superseded by a later press or release
+
+        if self._pressed:
+            self._long = True
+            self._count = 0
+            self._emit(GESTURE_LONG_PRESS, now)
+        else:
+            gesture = MULTI_PRESS[self._count]
+            self._reset()
+            self._emit(gesture, now)
+
+    def _schedule(self, deadline: float) -> None:
+        self._generation += 1
+        self._engine.schedule(self, self._generation, deadline)
+
+    def _reset(self) -> None:
+        self._count = 0
+        self._long = False
+        self._generation += 1
+
+
+class InelsGestureEngine:
+    """Run the gesture deadlines of all the buttons of a config entry.
+
+    The deadlines are kept in a heap and only the earliest one is armed in
+    the loop, so idle keypads cost nothing. Superseded deadlines are not
+    removed, they are skipped when they come up.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, multi_press_window: float, long_press_time: float
+    ) -> None:
+        """Initialize the engine, windows in seconds."""
+        self._hass = hass
+        self.multi_press_window = multi_press_window
+        self.long_press_time = long_press_time
+        self._heap: list[tuple[float, int, InelsGestureKey, int]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_at = 0.0
+
+    def add_key(self, emit: Callable[[str, float], None]) -> InelsGestureKey:
+        """Return the state machine of a new button."""
+        return InelsGestureKey(self, emit)
+
+    def schedule(self, key: InelsGestureKey, generation: int, deadline: float) -> None:
+        """Expire the key at the deadline."""
+        heapq.heappush(self._heap, (deadline, next(self._sequence), key, generation))
+        if self._timer is None or deadline < self._timer_at:
+            self._arm(deadline)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop all the pending gestures."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._heap.clear()
+
+    def _arm(self, deadline: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_at = deadline
+        self._timer = self._hass.loop.call_at(deadline, self._run)
+
+    @callback
+    def _run(self) -> None:
+        """Expire all the due keys and arm the next deadline."""
+        self._timer = None
+        now = self._hass.loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, _, key, generation = heapq.heappop(heap)
+            key.expire(generation, deadline)
+        if heap:
+            self._arm(heap[0][0])
@@ -0,0 +1,115 @@
+"""Health of the iNELS integration, sampled from the runtime counters."""
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+from typing import Any
+
+from inelsmqtt.const import MANUFACTURER
+from inelsmqtt.devices import Device
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .command import InelsCommandBuilder
+from .const import COMMANDS, DEVICES, DOMAIN, HEALTH_UPDATE_INTERVAL, LOGGER
+from .executor import get_executor
+from .metrics import get_metrics
+
+HEALTH_INBOUND = "inbound_messages"
+HEALTH_OUTBOUND = "outbound_commands"
+HEALTH_QUEUE_DEPTH = "queue_depth"
+HEALTH_CALLBACK_LATENCY = "callback_latency"
+HEALTH_UNAVAILABLE = "unavailable_devices"
+HEALTH_RECONNECTS = "reconnects"
+HEALTH_IO_UTILIZATION = "io_utilization"
+HEALTH_IO_QUEUE = "io_queue"
+
+
+def broker_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the virtual device of the broker, holding the health sensors."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{entry.entry_id}_broker")},
+        name="iNELS broker",
+        manufacturer=MANUFACTURER,
+        model=f"{entry.data.get(CONF_HOST)}:{entry.data.get(CONF_PORT)}",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+def _is_available(device: Device) -> bool:
+    """Return if the device is available, no status yet counts as unavailable."""
+    try:
+        return bool(device.is_available)
+    except (KeyError, AttributeError):
+        return False
+
+
+class InelsHealthCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Sample the counters of a config entry on a fixed interval.
+
+    The rates are the difference of the counters between two samples, nothing
+    is computed or written per message.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            LOGGER,
+            name=f"{DOMAIN} health",
+            update_interval=timedelta(seconds=HEALTH_UPDATE_INTERVAL),
+        )
+        self._entry_id = entry.entry_id
+        self._sampled_at = time.monotonic()
+        self._messages = 0
+        self._commands = 0
+        self._decoded = 0
+        self._decode_time = 0.0
+        self._busy_time = 0.0
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Sample the counters."""
+        inels_data = self.hass.data[DOMAIN][self._entry_id]
+        metrics = get_metrics(self.hass, self._entry_id)
+        executor = get_executor(self.hass, self._entry_id)
+        builders: dict[str, InelsCommandBuilder] = inels_data.get(COMMANDS, {})
+        devices: list[Device] = inels_data[DEVICES]
+
+        messages = commands = decoded = 0
+        decode_time = 0.0
+        for device_metrics in metrics.devices.values():
+            messages += device_metrics.messages
+            commands += device_metrics.commands
+            decoded += device_metrics.decode_time.count
+            decode_time += device_metrics.decode_time.total
+
+        now = time.monotonic()
+        elapsed = max(now - self._sampled_at, 1)
+        calls = decoded - self._decoded
+        latency = (decode_time - self._decode_time) / calls if calls else None
+        busy_time = executor.busy_time
+        utilization = (busy_time - self._busy_time) / (elapsed * executor.workers)
+
+        data = {
+            HEALTH_INBOUND: round((messages - self._messages) / elapsed, 2),
+            HEALTH_OUTBOUND: round((commands - self._commands) / elapsed, 2),
+            HEALTH_QUEUE_DEPTH: sum(builder.queued for builder in builders.values()),
+            HEALTH_CALLBACK_LATENCY: None if latency is None else round(latency, 3),
+            HEALTH_UNAVAILABLE: sum(not _is_available(device) for device in devices),
+            HEALTH_RECONNECTS: metrics.reconnects,
+            HEALTH_IO_UTILIZATION: round(min(utilization, 1) * 100, 1),
+            HEALTH_IO_QUEUE: executor.queued,
+        }
+
+        self._sampled_at = now
+        self._messages = messages
+        self._commands = commands
+        self._decoded = decoded
+        self._decode_time = decode_time
+        self._busy_time = busy_time
+        return data
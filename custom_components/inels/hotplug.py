@@ -0,0 +1,188 @@
+"""Devices plugged in after the setup of the iNELS integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from inelsmqtt import InelsMqtt
+from inelsmqtt.const import (
+    DEVICE_TYPE_DICT,
+    FRAGMENT_DEVICE_TYPE,
+    INELS_ASSUMED_STATE_DEVICES,
+    INELS_COMM_TEST_DICT,
+    INELS_DEVICE_TYPE_DICT,
+    MQTT_SET_TOPIC_PREFIX,
+    MQTT_STATUS_TOPIC_PREFIX,
+    MQTT_TOTAL_CONNECTED_TOPIC,
+    TOPIC_FRAGMENTS,
+)
+from inelsmqtt.devices import Device
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, LOGGER, SIGNAL_NEW_DEVICE
+from .executor import InelsExecutor
+
+_DEVICE_TYPE_FRAGMENT = TOPIC_FRAGMENTS[FRAGMENT_DEVICE_TYPE]
+
+
+def _stripped_topic(topic: str) -> str:
+    """Return the topic without the domain and the action, as the listeners."""
+    return "/".join(topic.split("/")[2:])
+
+
+class InelsHotPlug:
+    """Add the devices appearing on the broker after the setup.
+
+    The message handler of the client is wrapped to notice the topics of
+    unknown devices. Such a device is created in the entry executor and announced
+    to the platforms, which add only its entities.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        executor: InelsExecutor,
+        mqtt: InelsMqtt,
+        devices: list[Device],
+    ) -> None:
+        """Initialize the hot plug listener."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._executor = executor
+        self._mqtt = mqtt
+        self._devices = devices
+        self._known = {_stripped_topic(device.state_topic) for device in devices}
+        self._pending: set[str] = set()
+        self._handler: Callable[..., None] | None = None
+
+    def start(self) -> None:
+        """Listen to the announcements of new devices, runs in the executor."""
+        self._mqtt.client.subscribe(MQTT_TOTAL_CONNECTED_TOPIC)
+        self._wrap_handler()
+
+    def swap_broker(self, mqtt: InelsMqtt) -> None:
+        """Listen on a new broker session, runs in the executor."""
+        self._mqtt = mqtt
+        self._handler = None
+        self.start()
+
+    @callback
+    def async_retire(self, device: Device) -> None:
+        """Forget a removed device, it is added again if it shows up."""
+        topic = _stripped_topic(device.state_topic)
+        self._known.discard(topic)
+        self._mqtt.list_of_listeners.pop(topic, None)
+        if device in self._devices:
+            self._devices.remove(device)
+
+    def _wrap_handler(self) -> None:
+        """Install the handler, creating a device replaces it with its own."""
+        client = self._mqtt.client
+        if client.on_message is self._handler:
+            return
+        on_message = client.on_message
+
+        def handler(mqtt_client: Any, userdata: Any, msg: Any) -> None:
+            on_message(mqtt_client, userdata, msg)
+            self._message(msg.topic)
+
+        self._handler = handler
+        client.on_message = handler
+
+    def _message(self, topic: str) -> None:
+        """Check the topic of a message, runs in the mqtt thread."""
+        fragments = topic.split("/")
+        if len(fragments) != 5 or fragments[1] not in ("status", "connected"):
+            return
+        stripped = "/".join(fragments[2:])
+        if stripped in self._known or stripped in self._pending:
+            return
+        if fragments[_DEVICE_TYPE_FRAGMENT] not in DEVICE_TYPE_DICT:
+            return
+
+        self._pending.add(stripped)
+        self._hass.loop.call_soon_threadsafe(
+            self._async_found, stripped, fragments[1] == "status"
+        )
+
+    @callback
+    def _async_found(self, stripped: str, has_status: bool) -> None:
+        """Add the device once it reported a status, as the discovery does."""
+        device_type = stripped.split("/")[1]
+        inels_type = INELS_DEVICE_TYPE_DICT[device_type]
+        if has_status or inels_type in INELS_ASSUMED_STATE_DEVICES:
+            self._hass.async_create_task(self._async_add(stripped))
+            return
+
+        self._pending.discard(stripped)
+        if device_type in INELS_COMM_TEST_DICT:
+            # the device answers with its status, which adds it
+            self._hass.async_create_task(
+                self._executor.async_run(
+                    self._mqtt.publish,
+                    MQTT_SET_TOPIC_PREFIX + stripped,
+                    INELS_COMM_TEST_DICT[device_type],
+                )
+            )
+
+    async def _async_add(self, stripped: str) -> None:
+        """Create the device and announce it to the platforms."""
+        try:
+            device = await self._executor.async_run(
+                Device, self._mqtt, MQTT_STATUS_TOPIC_PREFIX + stripped
+            )
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Failed to add the new device %s", stripped)
+            self._pending.discard(stripped)
+            return
+        finally:
+            self._wrap_handler()
+
+        self._pending.discard(stripped)
+        self._known.add(stripped)
+        self._devices.append(device)
+        LOGGER.info("Found new device %s, adding its entities", device.unique_id)
+        async_dispatcher_send(
+            self._hass, SIGNAL_NEW_DEVICE.format(self._entry_id), device
+        )
+
+
+@callback
+def async_listen_new_devices(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    device_entities: Callable[[Device], list[Entity]],
+    async_add_entities: AddEntitiesCallback,
+    update_before_add: bool = False,
+) -> None:
+    """Add the entities of the devices plugged in after the platform setup."""
+
+    @callback
+    def async_add_device(device: Device) -> None:
+        if entities := device_entities(device):
+            async_add_entities(entities, update_before_add)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICE.format(config_entry.entry_id), async_add_device
+        )
+    )
+
+
+def find_device(
+    devices: list[Device], identifiers: set[tuple[str, str]]
+) -> Device | None:
+    """Return the device of a device registry entry."""
+    for device in devices:
+        if (DOMAIN, device.unique_id) in identifiers:
+            return device
+    return None
@@ -1,6 +1,7 @@
 """iNELS light."""
 from __future__ import annotations
 from dataclasses import dataclass, field
+from functools import cache
 from typing import Any, cast
 
 from inelsmqtt.devices import Device
@@ -13,56 +14,70 @@ from homeassistant.components.light import (
     ColorMode,
     LightEntity,
     LightEntityDescription,
+    LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import STATE_ON, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
+from .alert import InelsAlertTracker
 from .entity import InelsBaseEntity
+from .executor import get_executor
+from .hotplug import async_listen_new_devices
+from .transition import InelsRampScheduler
 from .const import (
     DEVICES,
     DOMAIN,
     ICON_FLASH,
     ICON_LIGHT,
-    LOGGER,
     OLD_ENTITIES,
 )
 
 
 # LIGHT PLATFORM
-@dataclass
+@dataclass(slots=True)
 class InelsLightAlert:
     """Inels light alert property description."""
 
     key: str
+    name: str
     message: str
 
 
 thermal_alert = InelsLightAlert(
-    key="toa", message="Thermal overload on light %s of device %d"
+    key="toa",
+    name="Thermal overload",
+    message="Thermal overload on light %s of device %s",
 )
 
 current_alert = InelsLightAlert(
-    key="coa", message="Current overload on light %s of device %d"
+    key="coa",
+    name="Current overload",
+    message="Current overload on light %s of device %s",
 )
 
 dali_comm = InelsLightAlert(
     key="alert_dali_communication",
-    message="Dali communication error on light %s of device %d",
+    name="DALI communication error",
+    message="Dali communication error on light %s of device %s",
 )
 
 dali_power = InelsLightAlert(
-    key="alert_dali_communication", message="Dali power error on light %s of device %d"
+    key="alert_dali_power",
+    name="DALI power error",
+    message="Dali power error on light %s of device %s",
 )
 
 aout_current = InelsLightAlert(
-    key="aout_coa", message="Current overload of AOUT %s of device %d"
+    key="aout_coa",
+    name="Current overload",
+    message="Current overload of AOUT %s of device %s",
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class InelsLightType:
     """Light type property description."""
 
@@ -105,14 +120,18 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS lights from config entry."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.LIGHT)
 
-    items = INELS_LIGHT_TYPES.items()
-    entities: list[InelsBaseEntity] = []
-    for device in device_list:
-        for key, type_dict in items:
+    ramp_scheduler = InelsRampScheduler(
+        hass, get_executor(hass, config_entry.entry_id)
+    )
+    config_entry.async_on_unload(ramp_scheduler.async_shutdown)
+
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        entities: list[InelsBaseEntity] = []
+        for key in INELS_LIGHT_TYPES:
             if hasattr(device.state, key):
                 if len(device.state.__dict__[key]) == 1:
                     entities.append(
@@ -120,12 +139,8 @@ async def async_setup_entry(
                             device=device,
                             key=key,
                             index=0,
-                            description=InelsLightDescription(
-                                key=key,
-                                name=type_dict.name,
-                                icon=type_dict.icon,
-                                color_modes=type_dict.color_modes,
-                            ),
+                            description=_light_description(key, -1),
+                            ramp_scheduler=ramp_scheduler,
                         )
                     )
                 else:
@@ -135,21 +150,20 @@ async def async_setup_entry(
                                 device=device,
                                 key=key,
                                 index=k,
-                                description=InelsLightDescription(
-                                    key=f"{key}{k}",
-                                    name=f"{type_dict.name} {k+1}",
-                                    icon=type_dict.icon,
-                                    color_modes=type_dict.color_modes,
-                                ),
+                                description=_light_description(key, k),
+                                ramp_scheduler=ramp_scheduler,
                             )
                         )
+        return entities
 
+    entities = [entity for device in device_list for entity in device_entities(device)]
     async_add_entities(entities, True)
+    async_listen_new_devices(
+        hass, config_entry, device_entities, async_add_entities, True
+    )
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(entity.entity_id for entity in entities)
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.LIGHT] = old_entities
 
@@ -162,6 +176,19 @@ class InelsLightDescription(LightEntityDescription):
     alerts: list[InelsLightAlert] | None = None
 
 
+@cache
+def _light_description(key: str, index: int) -> InelsLightDescription:
+    """Return the shared description of a light channel, '-1' for single channel."""
+    type_dict = INELS_LIGHT_TYPES[key]
+    return InelsLightDescription(
+        key=key if index == -1 else f"{key}{index}",
+        name=type_dict.name if index == -1 else f"{type_dict.name} {index+1}",
+        icon=type_dict.icon,
+        color_modes=type_dict.color_modes,
+        alerts=type_dict.alerts,
+    )
+
+
 class InelsLight(InelsBaseEntity, LightEntity):
     """Light class for HA."""
 
@@ -173,6 +200,7 @@ class InelsLight(InelsBaseEntity, LightEntity):
         key: str,
         index: int,
         description: InelsLightDescription,
+        ramp_scheduler: InelsRampScheduler,
     ) -> None:
         """Initialize a light."""
         super().__init__(
@@ -181,6 +209,9 @@ class InelsLight(InelsBaseEntity, LightEntity):
             index=index,
         )
         self._entity_description = description
+        self._ramp_scheduler = ramp_scheduler
+        self._alerts = InelsAlertTracker(description.alerts)
+        self._alerts.reset(self._device.state.__dict__[self.key][self.index])
 
         self._attr_unique_id = slugify(f"{self._attr_unique_id}_{description.key}")
         self.entity_id = f"{Platform.LIGHT}.{self._attr_unique_id}"
@@ -188,6 +219,7 @@ class InelsLight(InelsBaseEntity, LightEntity):
 
         self._attr_supported_color_modes: set[ColorMode] = set()
         self._attr_supported_color_modes |= set(description.color_modes)
+        self._attr_supported_features = LightEntityFeature.TRANSITION
         self._attr_min_color_temp_kelvin = (
             2700  # standard color temp, does not represent actual bulb
         )
@@ -195,24 +227,23 @@ class InelsLight(InelsBaseEntity, LightEntity):
             6500  # standard color temp, does not represent actual bulb
         )
 
+    def _callback(self) -> None:
+        """Evaluate the alerts once per status change of the channel."""
+        self._alerts.update(
+            self, self._device_id, self._device.state.__dict__[self.key][self.index]
+        )
+        super()._callback()
+
     @property
     def available(self) -> bool:
         """If it is available."""
-        if self._entity_description.alerts:
-            last_state = self._device.last_values.ha_value.__dict__[self.key][
-                self.index
-            ]
-            for alert in self._entity_description.alerts:
-                if hasattr(self._device.state, alert.key):
-                    if self._device.state.__dict__[alert.key]:
-                        if not last_state.__dict__[alert.key]:
-                            LOGGER.warning(alert.message, self.name, self._device_id)
-                        return False
-        return super().available
+        return not self._alerts.active and super().available
 
     @property
     def is_on(self) -> bool:
         """Return true if light is on."""
+        if (last := self._last_state) is not None:
+            return last.state == STATE_ON
         return self._device.state.__dict__[self.key][self.index].brightness > 0
 
     @property
@@ -223,6 +254,8 @@ class InelsLight(InelsBaseEntity, LightEntity):
     @property
     def brightness(self) -> int | None:
         """Light brightness."""
+        if (last := self._last_state) is not None:
+            return last.attributes.get(ATTR_BRIGHTNESS)
         return cast(
             int,
             self._device.state.__dict__[self.key][self.index].brightness * 2.55,
@@ -230,6 +263,10 @@ class InelsLight(InelsBaseEntity, LightEntity):
 
     @property
     def rgb_color(self) -> tuple[int, int, int] | None:
+        if (last := self._last_state) is not None and (
+            rgb := last.attributes.get(ATTR_RGB_COLOR)
+        ):
+            return tuple(rgb)
         state = self._device.state.__dict__[self.key][self.index]
         if hasattr(state, "r"):
             return (state.r, state.g, state.b)
@@ -237,6 +274,10 @@ class InelsLight(InelsBaseEntity, LightEntity):
 
     @property
     def color_temp_kelvin(self) -> int | None:
+        if (last := self._last_state) is not None and (
+            kelvin := last.attributes.get(ATTR_COLOR_TEMP_KELVIN)
+        ):
+            return kelvin
         state = self._device.state.__dict__[self.key][self.index]
         if hasattr(state, "relative_ct"):
             return int(
@@ -260,15 +301,18 @@ class InelsLight(InelsBaseEntity, LightEntity):
         if not self._device:
             return
 
-        transition = None
-        if ATTR_TRANSITION in kwargs:
-            transition = int(kwargs[ATTR_TRANSITION]) / 0.065
-            print(transition)
-        else:
-            # mount device ha value
-            ha_val = self._device.get_value().ha_value
-            ha_val.__dict__[self.key][self.index].brightness = 0
-            await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+        if kwargs.get(ATTR_TRANSITION):
+            self._ramp_scheduler.async_start(
+                self._device, self.key, self.index, 0, kwargs[ATTR_TRANSITION]
+            )
+            return
+
+        self._ramp_scheduler.async_cancel(self._device, self.key, self.index)
+
+        # mount device ha value
+        ha_val = self._device.get_value().ha_value
+        ha_val.__dict__[self.key][self.index].brightness = 0
+        await self._async_set_ha_value(ha_val)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Light to turn on."""
@@ -276,6 +320,7 @@ class InelsLight(InelsBaseEntity, LightEntity):
             return
 
         ha_val = self._device.get_value().ha_value
+        transition = kwargs.get(ATTR_TRANSITION)
 
         if ATTR_RGB_COLOR in kwargs:
             rgb = kwargs[ATTR_RGB_COLOR]
@@ -287,6 +332,12 @@ class InelsLight(InelsBaseEntity, LightEntity):
             brightness = int(kwargs[ATTR_BRIGHTNESS] / 2.55)
             brightness = min(brightness, 100)
 
+            if transition:
+                self._ramp_scheduler.async_start(
+                    self._device, self.key, self.index, brightness, transition
+                )
+                return
+
             ha_val.__dict__[self.key][self.index].brightness = brightness
         elif ATTR_COLOR_TEMP_KELVIN in kwargs:
             color_temp = int(kwargs[ATTR_COLOR_TEMP_KELVIN])
@@ -300,10 +351,19 @@ class InelsLight(InelsBaseEntity, LightEntity):
             last_val = self._device.last_values.ha_value
 
             # uses previously observed brightness value if it isn't 0
-            ha_val.__dict__[self.key][self.index].brightness = (
+            brightness = (
                 100
                 if last_val.__dict__[self.key][self.index].brightness == 0
                 else last_val.__dict__[self.key][self.index].brightness
             )
 
-        await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+            if transition:
+                self._ramp_scheduler.async_start(
+                    self._device, self.key, self.index, brightness, transition
+                )
+                return
+
+            ha_val.__dict__[self.key][self.index].brightness = brightness
+
+        self._ramp_scheduler.async_cancel(self._device, self.key, self.index)
+        await self._async_set_ha_value(ha_val)
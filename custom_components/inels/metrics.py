@@ -0,0 +1,225 @@
+"""Runtime counters of the iNELS devices."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+import time
+from typing import Any
+
+from inelsmqtt import InelsMqtt
+from inelsmqtt.devices import Device
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, METRICS
+
+# ms, the last bucket takes everything above
+HISTOGRAM_BOUNDS: tuple[float, ...] = (
+    0.5,
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+)
+
+
+class InelsHistogram:
+    """Histogram with fixed buckets, adding a value is a bisect and an increment."""
+
+    __slots__ = ("_bounds", "_counts", "count", "total")
+
+    def __init__(self, bounds: tuple[float, ...] = HISTOGRAM_BOUNDS) -> None:
+        """Initialize the histogram."""
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding the percentile.
+
+        Values above the last bound are reported as the last bound.
+        """
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, bucket in zip(self._bounds, self._counts):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return self._bounds[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for the diagnostics."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": {
+                str(bound): bucket
+                for bound, bucket in zip((*self._bounds, "inf"), self._counts)
+                if bucket
+            },
+        }
+
+
+class InelsDeviceMetrics:
+    """Counters of one device, updated from the mqtt thread without locking.
+
+    Only plain increments and assignments are done on the hot path, a lost
+    update under contention is acceptable for diagnostics.
+    """
+
+    __slots__ = (
+        "messages",
+        "duplicates",
+        "decode_time",
+        "commands",
+        "round_trip",
+        "last_seen",
+        "subscriptions",
+        "status_listeners",
+        "_created",
+        "_last_payload",
+        "_command_sent",
+        "_on_message",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.messages = 0
+        self.duplicates = 0
+        self.decode_time = InelsHistogram()
+        self.commands = 0
+        self.round_trip = InelsHistogram()
+        self.last_seen: float | None = None
+        self.subscriptions = 0
+        # called with the receive time of every status, also the duplicates
+        self.status_listeners: list[Callable[[float], None]] = []
+        self._created = time.monotonic()
+        self._last_payload: Any = None
+        self._command_sent: float | None = None
+        self._on_message: Callable[[bool], None] | None = None
+
+    def command_sent(self) -> None:
+        """Count a command being published, its echo is the next status."""
+        self.commands += 1
+        self._command_sent = time.monotonic()
+
+    def add_status_listener(self, fnc: Callable[[float], None]) -> Callable[[], None]:
+        """Register a listener of every status of the device, return its remover."""
+        # lists are replaced, not mutated, as the messages come in the mqtt thread
+        self.status_listeners = [*self.status_listeners, fnc]
+
+        def remove_listener() -> None:
+            self.status_listeners = [
+                listener for listener in self.status_listeners if listener is not fnc
+            ]
+
+        return remove_listener
+
+    def metered_callback(self, device: Device) -> Callable[[bool], None]:
+        """Return the device callback wrapped to count its messages.
+
+        A status identical to the last processed one is not decoded again, it
+        could not change any entity. The status listeners get both.
+        """
+        if self._on_message is not None:
+            return self._on_message
+
+        topic = device.state_topic
+
+        def on_message(is_connected_message: bool) -> None:
+            received = time.monotonic()
+            self.last_seen = received
+
+            if not is_connected_message:
+                self.messages += 1
+                if (sent := self._command_sent) is not None:
+                    self._command_sent = None
+                    self.round_trip.add((received - sent) * 1000)
+
+                # the session of the device is swapped on a broker change
+                payload = device.mqtt.messages().get(topic)
+                if payload is not None and payload == self._last_payload:
+                    self.duplicates += 1
+                    for listener in self.status_listeners:
+                        listener(received)
+                    return
+                self._last_payload = payload
+
+            device.callback(is_connected_message)
+            self.decode_time.add((time.monotonic() - received) * 1000)
+
+            if not is_connected_message:
+                for listener in self.status_listeners:
+                    listener(received)
+
+        self._on_message = on_message
+        return on_message
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for the diagnostics."""
+        minutes = max(time.monotonic() - self._created, 1) / 60
+        return {
+            "messages": self.messages,
+            "messages_per_minute": round(self.messages / minutes, 2),
+            "duplicates_suppressed": self.duplicates,
+            "decode_time_ms": self.decode_time.as_dict(),
+            "commands": self.commands,
+            "commands_per_minute": round(self.commands / minutes, 2),
+            "command_round_trip_ms": self.round_trip.as_dict(),
+            "last_seen_age_s": None
+            if self.last_seen is None
+            else round(time.monotonic() - self.last_seen, 1),
+            "subscriptions": self.subscriptions,
+        }
+
+
+class InelsMetrics:
+    """Counters of all the devices of a config entry."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.devices: dict[str, InelsDeviceMetrics] = {}
+        self.reconnects = 0
+
+    def track_reconnects(self, mqtt: InelsMqtt) -> None:
+        """Count the connections of the broker client made from now on."""
+        client = mqtt.client
+        on_connect = client.on_connect
+
+        def counted_on_connect(*args: Any, **kwargs: Any) -> None:
+            self.reconnects += 1
+            on_connect(*args, **kwargs)
+
+        client.on_connect = counted_on_connect
+
+    def device(self, unique_id: str) -> InelsDeviceMetrics:
+        """Return the counters of a device."""
+        if (metrics := self.devices.get(unique_id)) is None:
+            metrics = self.devices[unique_id] = InelsDeviceMetrics()
+        return metrics
+
+
+def get_metrics(hass: HomeAssistant, entry_id: str) -> InelsMetrics:
+    """Return the counters of a config entry."""
+    return hass.data[DOMAIN][entry_id].setdefault(METRICS, InelsMetrics())
@@ -0,0 +1,366 @@
+"""Opt-in profiler of the iNELS hot paths."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import heapq
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any
+
+import inelsmqtt
+from inelsmqtt.devices import Device
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.entity_platform import async_get_platforms
+import homeassistant.util.dt as dt_util
+
+from . import command
+from .const import DEVICES, DOMAIN, LOGGER, PROFILER, SERVICE_PROFILE
+from .entity import set_callback_wrapper
+
+ATTR_ENABLED = "enabled"
+
+HOOK_DEVICE_CALLBACK = "device_callback"
+HOOK_ENTITY_CALLBACK = "entity_callback"
+HOOK_SET_HA_VALUE = "set_ha_value"
+HOOK_PUBLISH = "publish"
+HOOK_PLATFORM_SETUP = "platform_setup"
+
+WORST_OFFENDERS = 20
+MEMORY_TOP_FILES = 20
+
+# the traced allocations are reported for the integration and its library
+_TRACED_ROOTS = (
+    os.path.dirname(__file__),
+    os.path.dirname(inelsmqtt.__file__),
+)
+
+PROFILE_SCHEMA = vol.Schema({vol.Required(ATTR_ENABLED): cv.boolean})
+
+
+class InelsProfileStat:
+    """Cumulative time of one hook of a group."""
+
+    __slots__ = ("calls", "total", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize the stat."""
+        self.calls = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stat in ms."""
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.calls, 3),
+            "max_ms": round(self.maximum * 1000, 3),
+        }
+
+
+class InelsProfiler:
+    """Time the hot paths per platform and per device type.
+
+    Nothing is wrapped while disabled: enabling swaps the device methods, the
+    publish of the commands, the entity callbacks of the fan-out and the
+    platform setups for timed ones, disabling puts the originals back. It also
+    traces the memory allocations, unless tracemalloc was already running.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.enabled = False
+        self._started: datetime | None = None
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str, str], InelsProfileStat] = {}
+        self._worst: list[tuple[float, int, str, str]] = []
+        self._sequence = itertools.count()
+        self._originals: list[tuple[Any, str, Any]] = []
+        self._tracing = False
+
+    def enable(self) -> None:
+        """Start profiling from a clean slate."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._started = dt_util.utcnow()
+        self._stats = {}
+        self._worst = []
+
+        self._patch(Device, "callback", self._wrap_device_callback)
+        self._patch(Device, "set_ha_value", self._wrap_set_ha_value)
+        self._patch(command, "publish_changes", self._wrap_publish)
+        for name, module in list(sys.modules.items()):
+            if name.startswith(f"{__package__}.") and hasattr(
+                module, "async_setup_entry"
+            ):
+                self._patch(module, "async_setup_entry", self._wrap_platform_setup)
+        set_callback_wrapper(self._wrap_entity_callback)
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def disable(self) -> None:
+        """Stop profiling, the results are kept until enabled again."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        set_callback_wrapper(None)
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    async def async_memory(self, hass: HomeAssistant) -> dict[str, Any]:
+        """Return the memory footprint per entity class and per device.
+
+        The sizes are shallow: the object, its attribute dict and the values
+        in it, objects shared by several entities are counted for each.
+        """
+        entities: dict[str, list[int]] = {}
+        for platform in async_get_platforms(hass, DOMAIN):
+            for entity in platform.entities.values():
+                entities.setdefault(type(entity).__name__, []).append(
+                    _shallow_size(entity)
+                )
+
+        devices = [
+            _shallow_size(device) + _shallow_size(device.state)
+            for data in hass.data.get(DOMAIN, {}).values()
+            if isinstance(data, dict)
+            for device in data.get(DEVICES, [])
+        ]
+
+        return {
+            "bytes_per_entity": {
+                name: {"count": len(sizes), "bytes": sum(sizes) // len(sizes)}
+                for name, sizes in sorted(entities.items())
+            },
+            "bytes_per_device": {
+                "count": len(devices),
+                "bytes": sum(devices) // len(devices) if devices else None,
+            },
+            # allocations made since the profiler was enabled, reload the
+            # entry meanwhile to trace the setup
+            "traced_by_file": await hass.async_add_executor_job(_traced_by_file)
+            if tracemalloc.is_tracing()
+            else None,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the results."""
+        by_group: dict[str, dict[str, dict[str, Any]]] = {
+            "platform": {},
+            "device_type": {},
+        }
+        for (group, name, hook), stat in sorted(self._stats.items()):
+            by_group[group].setdefault(name, {})[hook] = stat.as_dict()
+
+        return {
+            "enabled": self.enabled,
+            "started": self._started.isoformat() if self._started else None,
+            "by_platform": by_group["platform"],
+            "by_device_type": by_group["device_type"],
+            "worst_offenders": [
+                {"hook": hook, "source": source, "ms": round(duration * 1000, 3)}
+                for duration, _, hook, source in sorted(self._worst, reverse=True)
+            ],
+        }
+
+    def _patch(self, owner: Any, name: str, wrap: Callable[[Any], Any]) -> None:
+        original = getattr(owner, name)
+        self._originals.append((owner, name, original))
+        setattr(owner, name, wrap(original))
+
+    def _record(
+        self, hook: str, groups: tuple[tuple[str, str], ...], source: str, took: float
+    ) -> None:
+        """Add a timed call, may run in the mqtt thread or the executor."""
+        with self._lock:
+            for group, name in groups:
+                if (stat := self._stats.get((group, name, hook))) is None:
+                    stat = self._stats[(group, name, hook)] = InelsProfileStat()
+                stat.calls += 1
+                stat.total += took
+                if took > stat.maximum:
+                    stat.maximum = took
+
+            entry = (took, next(self._sequence), hook, source)
+            if len(self._worst) < WORST_OFFENDERS:
+                heapq.heappush(self._worst, entry)
+            elif took > self._worst[0][0]:
+                heapq.heapreplace(self._worst, entry)
+
+    def _wrap_device_callback(
+        self, original: Callable[[Device, bool], None]
+    ) -> Callable[[Device, bool], None]:
+        def callback(device: Device, availability_update: bool) -> None:
+            start = time.perf_counter()
+            try:
+                original(device, availability_update)
+            finally:
+                self._record(
+                    HOOK_DEVICE_CALLBACK,
+                    (("device_type", device.inels_type),),
+                    device.unique_id,
+                    time.perf_counter() - start,
+                )
+
+        return callback
+
+    def _wrap_set_ha_value(
+        self, original: Callable[[Device, Any], bool]
+    ) -> Callable[[Device, Any], bool]:
+        def set_ha_value(device: Device, value: Any) -> bool:
+            start = time.perf_counter()
+            try:
+                return original(device, value)
+            finally:
+                self._record(
+                    HOOK_SET_HA_VALUE,
+                    (("device_type", device.inels_type),),
+                    device.unique_id,
+                    time.perf_counter() - start,
+                )
+
+        return set_ha_value
+
+    def _wrap_publish(
+        self, original: Callable[[Device, list[command.InelsChange]], bool]
+    ) -> Callable[[Device, list[command.InelsChange]], bool]:
+        def publish_changes(device: Device, changes: list[command.InelsChange]) -> bool:
+            start = time.perf_counter()
+            try:
+                return original(device, changes)
+            finally:
+                self._record(
+                    HOOK_PUBLISH,
+                    (("device_type", device.inels_type),),
+                    device.unique_id,
+                    time.perf_counter() - start,
+                )
+
+        return publish_changes
+
+    def _wrap_entity_callback(self, original: Callable[[], None]) -> Callable[[], None]:
+        owner = getattr(original, "__self__", None)
+        device: Device | None = getattr(owner, "_device", None)
+        device_type = device.inels_type if device else "-"
+
+        def entity_callback() -> None:
+            start = time.perf_counter()
+            try:
+                original()
+            finally:
+                # the entity may not have been added yet when it was wrapped
+                platform = getattr(getattr(owner, "platform", None), "domain", None)
+                self._record(
+                    HOOK_ENTITY_CALLBACK,
+                    (
+                        ("platform", platform or type(owner).__name__),
+                        ("device_type", device_type),
+                    ),
+                    getattr(owner, "entity_id", None) or repr(owner),
+                    time.perf_counter() - start,
+                )
+
+        entity_callback.inels_original = original  # type: ignore[attr-defined]
+        return entity_callback
+
+    def _wrap_platform_setup(
+        self, original: Callable[..., Awaitable[None]]
+    ) -> Callable[..., Awaitable[None]]:
+        platform = original.__module__.rpartition(".")[2]
+
+        async def async_setup_entry(*args: Any, **kwargs: Any) -> None:
+            start = time.perf_counter()
+            try:
+                await original(*args, **kwargs)
+            finally:
+                self._record(
+                    HOOK_PLATFORM_SETUP,
+                    (("platform", platform),),
+                    platform,
+                    time.perf_counter() - start,
+                )
+
+        return async_setup_entry
+
+
+def _shallow_size(obj: Any) -> int:
+    """Return the size of the object, its attribute dict and the values in it."""
+    size = sys.getsizeof(obj)
+    if (attrs := getattr(obj, "__dict__", None)) is not None:
+        size += sys.getsizeof(attrs)
+        size += sum(sys.getsizeof(value) for value in attrs.values())
+    return size
+
+
+def _traced_by_file() -> dict[str, dict[str, Any]]:
+    """Return the traced memory allocated by the integration and its library."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(True, os.path.join(root, "*")) for root in _TRACED_ROOTS]
+    )
+    return {
+        _traced_name(stat.traceback[0].filename): {
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("filename")[:MEMORY_TOP_FILES]
+    }
+
+
+def _traced_name(filename: str) -> str:
+    """Return the file name relative to its package, e.g. inels/light.py."""
+    for root in _TRACED_ROOTS:
+        if filename.startswith(root):
+            return os.path.relpath(filename, os.path.dirname(root))
+    return filename
+
+
+def get_profiler(hass: HomeAssistant) -> InelsProfiler:
+    """Return the profiler, shared by all the config entries."""
+    return hass.data.setdefault(PROFILER, InelsProfiler())
+
+
+def _write_results(path: str, results: dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+
+def async_setup_profiler(hass: HomeAssistant) -> None:
+    """Register the service turning the profiler on and off."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def async_profile(call: ServiceCall) -> None:
+        profiler = get_profiler(hass)
+        if call.data[ATTR_ENABLED]:
+            profiler.enable()
+            LOGGER.info("Profiler started")
+            return
+
+        memory = await profiler.async_memory(hass)
+        profiler.disable()
+        path = hass.config.path(f"{DOMAIN}_profile.json")
+        await hass.async_add_executor_job(
+            _write_results, path, {**profiler.as_dict(), "memory": memory}
+        )
+        LOGGER.info("Profiler stopped, results written to %s", path)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any
 
 from inelsmqtt.devices import Device
 
@@ -14,7 +13,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
+from .command import InelsChange
 from .entity import InelsBaseEntity
+from .hotplug import async_listen_new_devices
 from .const import (
     DEVICES,
     DOMAIN,
@@ -27,7 +28,7 @@ from .const import (
 
 
 # SELECT PLATFORM
-@dataclass
+@dataclass(slots=True)
 class InelsSelectType:
     """Select type property description."""
 
@@ -58,17 +59,22 @@ class InelsSelectEntityDescription(
 ):
     """Class for describing the iNELS select entities."""
 
-    value: Callable[[Device, str], Any | None] | None = None
-
+    value: Callable[[Device, str], list[InelsChange]] | None = None
 
-def __set_fan_speed(device: Device, option: str) -> Any | None:
-    """Process option value and set fan speed."""
-    ha_val = device.state
 
+def __set_fan_speed(device: Device, option: str) -> list[InelsChange]:
+    """Process option value into the fan speed change."""
     if option in FAN_SPEED_DICT:
-        ha_val.fan_speed = FAN_SPEED_DICT[option]
+        return [InelsChange("fan_speed", -1, None, FAN_SPEED_DICT[option])]
+
+    return []
 
-    return ha_val
+
+FAN_SPEED_DESCRIPTION = InelsSelectEntityDescription(
+    key="fan_speed",
+    name="Fan speed",
+    value=__set_fan_speed,
+)
 
 
 async def async_setup_entry(
@@ -78,33 +84,31 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS select entity."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.SELECT)
 
-    entities: list[InelsSelect] = []
-
-    for device in device_list:
+    def device_entities(device: Device) -> list[InelsSelect]:
         val = device.get_value()
-        if hasattr(val.ha_value, "fan_speed"):
-            entities.append(
-                InelsSelect(
-                    device,
-                    key="fan_speed",
-                    index=-1,
-                    description=InelsSelectEntityDescription(
-                        key="fan_speed",
-                        name="Fan speed",
-                        value=__set_fan_speed,
-                    ),
-                )
+        if not hasattr(val.ha_value, "fan_speed"):
+            return []
+        return [
+            InelsSelect(
+                device,
+                key="fan_speed",
+                index=-1,
+                description=FAN_SPEED_DESCRIPTION,
             )
+        ]
+
+    entities = [entity for device in device_list for entity in device_entities(device)]
     async_add_entities(entities, True)
+    async_listen_new_devices(
+        hass, config_entry, device_entities, async_add_entities, True
+    )
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(entity.entity_id for entity in entities)
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.SELECT] = old_entities
 
@@ -149,6 +153,8 @@ class InelsSelect(InelsBaseEntity, SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the current selected option."""
+        if (last := self._last_state) is not None and last.state in self.options:
+            return last.state
         state = self._device.state
         option = state.__dict__[self.key]
         return SELECT_OPTIONS_DICT[self.key][state.__dict__[self.key]]
@@ -164,6 +170,6 @@ class InelsSelect(InelsBaseEntity, SelectEntity):
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         if self.entity_description.value:
-            new_ha_val = self.entity_description.value(self._device, option)
-
-            self.hass.async_add_executor_job(self._device.set_ha_value, new_ha_val)
+            await self._async_send(
+                *self.entity_description.value(self._device, option)
+            )
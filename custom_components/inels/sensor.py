@@ -1,7 +1,10 @@
 """iNELS sensor entity."""
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
+from functools import cache, lru_cache
+import time
 from typing import Any
 
 from inelsmqtt.const import (  # Data types
@@ -14,39 +17,68 @@ from inelsmqtt.const import (
 )
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     LIGHT_LUX,
     PERCENTAGE,
+    EntityCategory,
     Platform,
     UnitOfElectricPotential,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
 from .entity import InelsBaseEntity
+from .health import (
+    HEALTH_CALLBACK_LATENCY,
+    HEALTH_INBOUND,
+    HEALTH_IO_QUEUE,
+    HEALTH_IO_UTILIZATION,
+    HEALTH_OUTBOUND,
+    HEALTH_QUEUE_DEPTH,
+    HEALTH_RECONNECTS,
+    HEALTH_UNAVAILABLE,
+    InelsHealthCoordinator,
+    broker_device_info,
+)
+from .hotplug import async_listen_new_devices
+from .metrics import get_metrics
 from .const import (
+    CONF_STATISTICS_WINDOW,
+    DEFAULT_STATISTICS_WINDOW,
     DEVICES,
     DOMAIN,
     ICON_CARD_ID,
     ICON_DEW_POINT,
     ICON_FLASH,
+    ICON_GAUGE,
     ICON_HUMIDITY,
+    ICON_LAN_DISCONNECT,
     ICON_LIGHT_IN,
+    ICON_MESSAGE_IN,
+    ICON_MESSAGE_OUT,
+    ICON_QUEUE,
+    ICON_RECONNECT,
     ICON_TEMPERATURE,
+    ICON_TIMER,
     LOGGER,
     OLD_ENTITIES,
+    SENSOR_ERROR_LOG_INTERVAL,
 )
 
 
 # SENSOR PLATFORM
-@dataclass
+@dataclass(slots=True)
 class InelsSensorType:
     """Select type property description."""
 
@@ -56,6 +88,7 @@ class InelsSensorType:
     indexed: bool = False
     raw_sensor_value: bool = False
     device_class: SensorDeviceClass | None = None
+    statistics: bool = True
 
 
 INELS_SENSOR_TYPES: dict[str, InelsSensorType] = {
@@ -119,30 +152,149 @@ INELS_SENSOR_TYPES: dict[str, InelsSensorType] = {
         name="Last card ID",
         icon=ICON_CARD_ID,
         unit=None,
-        raw_sensor_value=False,
+        # the hex card ID, as the access list services take it
+        raw_sensor_value=True,
+        statistics=False,
     ),
 }
 
 
-def _process_value(val: str) -> tuple[str, bool]:
-    middle_fs = True
-    for k in val[1:-1]:
-        if k.capitalize() != "F":
-            middle_fs = False
+# bus sensors report errors as "7", padding "F"s and the error code as last digit
+_SENSOR_ERROR_CODES: dict[str, int] = {
+    f"7{'F' * padding}{code:X}": code
+    for padding in range(7)
+    for code in BUS_SENSOR_ERRORS
+}
+
+
+@lru_cache(maxsize=512)
+def _process_value(val: str) -> tuple[float, int | None]:
+    """Decode a raw hex sensor value, with the error code if it is an error report."""
+    return (int(val, 16) / 100, _SENSOR_ERROR_CODES.get(val.upper()))
+
+
+class InelsRollingStatistics:
+    """Rolling mean, min, max and slope over the last samples of a sensor.
+
+    The samples are kept in a ring buffer and every statistic is updated in
+    O(1) per sample (amortized for min and max), so the derived sensors need
+    no recorder queries.
+    """
+
+    __slots__ = (
+        "_window",
+        "_samples",
+        "_min",
+        "_max",
+        "_count",
+        "_timestamp",
+        "_origin",
+        "_sum_t",
+        "_sum_v",
+        "_sum_tt",
+        "_sum_tv",
+    )
+
+    def __init__(self, window: int) -> None:
+        """Initialize the statistics."""
+        self._window = window
+        self._samples: deque[tuple[float, float]] = deque(maxlen=window)
+        # monotonic queues of (sample number, value) for min and max
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+        self._count = 0
+        self._timestamp: float | None = None
+
+        # running sums of the least squares fit, time relative to _origin
+        self._origin = 0.0
+        self._sum_t = 0.0
+        self._sum_v = 0.0
+        self._sum_tt = 0.0
+        self._sum_tv = 0.0
+
+    def add(self, value: float, timestamp: float) -> None:
+        """Add the sample of a status, counted once for all the sensors sharing it."""
+        if timestamp == self._timestamp:
+            return
+        self._timestamp = timestamp
+
+        if len(self._samples) == self._window:
+            old_t, old_v = self._samples[0]
+            self._remove_sums(old_t - self._origin, old_v)
+        self._samples.append((timestamp, value))
+        self._count += 1
+
+        if self._count % self._window == 0:
+            # rebase the sums now and then, they would drift off otherwise
+            self._rebuild_sums()
+        else:
+            self._add_sums(timestamp - self._origin, value)
+
+        oldest = self._count - self._window
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((self._count, value))
+        if self._min[0][0] <= oldest:
+            self._min.popleft()
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((self._count, value))
+        if self._max[0][0] <= oldest:
+            self._max.popleft()
+
+    def _add_sums(self, t: float, v: float) -> None:
+        self._sum_t += t
+        self._sum_v += v
+        self._sum_tt += t * t
+        self._sum_tv += t * v
+
+    def _remove_sums(self, t: float, v: float) -> None:
+        self._sum_t -= t
+        self._sum_v -= v
+        self._sum_tt -= t * t
+        self._sum_tv -= t * v
+
+    def _rebuild_sums(self) -> None:
+        self._origin = self._samples[0][0]
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        for timestamp, value in self._samples:
+            self._add_sums(timestamp - self._origin, value)
 
-    if (
-        middle_fs
-        and val[0] == "7"
-        and ((val[-1] <= "F" and val[-1] >= "A") or val[-1] == "9")
-    ):
-        last = val[-1]
-        last = int(last, 16)
-        error = BUS_SENSOR_ERRORS.get(last)
-        if error is not None:
-            LOGGER.warning(error)
-            return (float(int(val, 16)) / 100, True)
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the window."""
+        if not self._samples:
+            return None
+        return round(self._sum_v / len(self._samples), 2)
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the minimum of the window."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the maximum of the window."""
+        return self._max[0][1] if self._max else None
 
-    return (float(int(val, 16)) / 100, False)
+    @property
+    def slope(self) -> float | None:
+        """Return the least squares slope of the window, per hour."""
+        count = len(self._samples)
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if count < 2 or denominator <= 0:
+            return None
+        slope = (count * self._sum_tv - self._sum_t * self._sum_v) / denominator
+        return round(slope * 3600, 2)
+
+
+STATISTICS = {
+    "mean": ("Mean", lambda stats: stats.mean),
+    "min": ("Min", lambda stats: stats.minimum),
+    "max": ("Max", lambda stats: stats.maximum),
+    "slope": ("Rate of change", lambda stats: stats.slope),
+}
 
 
 @dataclass
@@ -157,6 +309,63 @@ class InelsSensorDescription(SensorEntityDescription, InelsSensorDescriptionMixi
     raw_sensor_value: bool = False
 
 
+# integration health, on the virtual broker device
+HEALTH_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key=HEALTH_INBOUND,
+        name="Inbound messages",
+        icon=ICON_MESSAGE_IN,
+        native_unit_of_measurement="msg/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=HEALTH_OUTBOUND,
+        name="Outbound commands",
+        icon=ICON_MESSAGE_OUT,
+        native_unit_of_measurement="cmd/s",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=HEALTH_QUEUE_DEPTH,
+        name="Command queue depth",
+        icon=ICON_QUEUE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=HEALTH_CALLBACK_LATENCY,
+        name="Average callback latency",
+        icon=ICON_TIMER,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=HEALTH_UNAVAILABLE,
+        name="Unavailable devices",
+        icon=ICON_LAN_DISCONNECT,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=HEALTH_RECONNECTS,
+        name="Reconnects",
+        icon=ICON_RECONNECT,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    SensorEntityDescription(
+        key=HEALTH_IO_UTILIZATION,
+        name="I/O executor utilization",
+        icon=ICON_GAUGE,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=HEALTH_IO_QUEUE,
+        name="I/O executor queue",
+        icon=ICON_QUEUE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -164,57 +373,105 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS switch.."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.SENSOR)
 
-    items = INELS_SENSOR_TYPES.items()
-    entities: list[InelsBaseEntity] = []
-    for device in device_list:
-        for key, type_dict in items:
+    window: int = config_entry.options.get(
+        CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW
+    )
+
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        entities: list[InelsBaseEntity] = []
+        for key, type_dict in INELS_SENSOR_TYPES.items():
             if hasattr(device.state, key):
-                if type_dict.indexed:
-                    for k in range(len(device.state.__dict__[key])):
-                        entities.append(
-                            InelsSensor(
-                                device=device,
-                                key=key,
-                                index=k,
-                                description=InelsSensorDescription(
-                                    key=f"{key}{k}",
-                                    name=f"{type_dict.name} {k+1}",
-                                    icon=type_dict.icon,
-                                    native_unit_of_measurement=type_dict.unit,
-                                    raw_sensor_value=type_dict.raw_sensor_value,
-                                ),
-                            )
-                        )
-                else:
+                indexes = (
+                    range(len(device.state.__dict__[key]))
+                    if type_dict.indexed
+                    else [-1]
+                )
+                for k in indexes:
+                    statistics = None
+                    if window > 0 and type_dict.statistics:
+                        statistics = InelsRollingStatistics(window)
+
                     entities.append(
                         InelsSensor(
                             device=device,
                             key=key,
-                            index=-1,
-                            description=InelsSensorDescription(
-                                key=key,
-                                name=type_dict.name,
-                                icon=type_dict.icon,
-                                native_unit_of_measurement=type_dict.unit,
-                                raw_sensor_value=type_dict.raw_sensor_value,
-                            ),
+                            index=k,
+                            description=_sensor_description(key, k),
+                            statistics=statistics,
                         )
                     )
+                    if statistics is None:
+                        continue
+
+                    for stat in STATISTICS:
+                        entities.append(
+                            InelsStatisticsSensor(
+                                device=device,
+                                key=key,
+                                index=k,
+                                description=_statistics_description(key, k, stat),
+                                statistics=statistics,
+                                stat=stat,
+                            )
+                        )
+        return entities
+
+    entities = [entity for device in device_list for entity in device_entities(device)]
+
+    coordinator = InelsHealthCoordinator(hass, config_entry)
+    await coordinator.async_config_entry_first_refresh()
+    health_sensors = [
+        InelsHealthSensor(coordinator, config_entry, description)
+        for description in HEALTH_SENSORS
+    ]
+
     async_add_entities(entities, True)
+    async_add_entities(health_sensors)
+    async_listen_new_devices(
+        hass, config_entry, device_entities, async_add_entities, True
+    )
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(
+            entity.entity_id for entity in [*entities, *health_sensors]
+        )
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.SENSOR] = old_entities
 
 
-class InelsSensor(InelsBaseEntity, SensorEntity):
+@cache
+def _sensor_description(key: str, index: int) -> InelsSensorDescription:
+    """Return the shared description of a sensor, '-1' for no index."""
+    type_dict = INELS_SENSOR_TYPES[key]
+    return InelsSensorDescription(
+        key=key if index == -1 else f"{key}{index}",
+        name=type_dict.name if index == -1 else f"{type_dict.name} {index+1}",
+        icon=type_dict.icon,
+        native_unit_of_measurement=type_dict.unit,
+        raw_sensor_value=type_dict.raw_sensor_value,
+    )
+
+
+@cache
+def _statistics_description(key: str, index: int, stat: str) -> InelsSensorDescription:
+    """Return the shared description of a rolling statistic of a sensor."""
+    source = _sensor_description(key, index)
+    name, _ = STATISTICS[stat]
+    unit = source.native_unit_of_measurement
+    return InelsSensorDescription(
+        key=f"{source.key}_{stat}",
+        name=f"{source.name} {name.lower()}",
+        icon=source.icon,
+        native_unit_of_measurement=f"{unit}/h" if stat == "slope" and unit else unit,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+
+
+class InelsSensor(InelsBaseEntity, RestoreSensor):
     """Platform class for Home assistant, bus version."""
 
     entity_description: InelsSensorDescription
@@ -226,42 +483,171 @@ class InelsSensor(InelsBaseEntity, SensorEntity):
         key: str,
         index: int,
         description: InelsSensorDescription,
+        statistics: InelsRollingStatistics | None = None,
     ) -> None:
         """Initialize bus sensor."""
         super().__init__(device=device, key=key, index=index)
 
         self.entity_description = description
+        self._statistics = statistics
 
         self._attr_unique_id = slugify(f"{self._attr_unique_id}_{description.key}")
         self.entity_id = f"{Platform.SENSOR}.{self._attr_unique_id}"
         self._attr_name = f"{self._attr_name} {description.name}"
 
-        if self.index != -1:  # with index
-            val = self._device.state.__dict__[self.key][self.index]
-        else:
-            val = self._device.state.__dict__[self.key]
-
-        if not self.entity_description.raw_sensor_value and isinstance(val, str):
-            val, self.sensor_error = _process_value(val)
+        self._logged_error: int | None = None
+        self._logged_error_at = 0.0
 
         self._attr_device_class = self.entity_description.device_class
         self._attr_icon = self.entity_description.icon
-        self._attr_native_value = val
-
-    def _callback(self) -> None:
-        """Refresh data."""
-        super()._callback()
+        self._attr_native_value = self._read_value()
 
+    def _state_value(self) -> Any:
+        """Return the raw sensor value of the device state."""
         if self.index != -1:  # with index
-            val = self._device.state.__dict__[self.key][self.index]
-        else:
-            val = self._device.state.__dict__[self.key]
+            return self._device.state.__dict__[self.key][self.index]
+        return self._device.state.__dict__[self.key]
+
+    def _read_value(self) -> Any:
+        """Read the sensor value from the device state."""
+        val = self._state_value()
 
         if (not self.entity_description.raw_sensor_value) and isinstance(val, str):
-            val, self.sensor_error = _process_value(val)
+            val, error = _process_value(val)
+            self.sensor_error = error is not None
+            if error is not None:
+                self._log_sensor_error(error)
+
+        return val
+
+    async def async_added_to_hass(self) -> None:
+        """Feed the statistics with every status of the device."""
+        await super().async_added_to_hass()
+        if self._statistics is not None:
+            metrics = get_metrics(self.hass, self.platform.config_entry.entry_id)
+            self.async_on_remove(
+                metrics.device(self._device.unique_id).add_status_listener(
+                    self._status
+                )
+            )
+
+    def _status(self, received: float) -> None:
+        """Add the value of a status, unchanged ones too, runs in the mqtt thread.
+
+        The window holds the last statuses, a steady value is not outweighed
+        by a short volatile period.
+        """
+        val = self._state_value()
+        if (not self.entity_description.raw_sensor_value) and isinstance(val, str):
+            val, error = _process_value(val)
+            if error is not None:
+                return
+        if isinstance(val, (int, float)):
+            self._statistics.add(val, received)
+
+    def _log_sensor_error(self, error: int) -> None:
+        """Log a sensor error, repeated reports only once per interval."""
+        now = time.monotonic()
+        if (
+            error == self._logged_error
+            and now - self._logged_error_at < SENSOR_ERROR_LOG_INTERVAL
+        ):
+            return
+
+        self._logged_error = error
+        self._logged_error_at = now
+        LOGGER.warning("%s: %s", self._attr_name, BUS_SENSOR_ERRORS[error])
+
+    async def _async_restore(self, state: State) -> None:
+        """Take the last value of the sensor, in its native unit."""
+        if (data := await self.async_get_last_sensor_data()) is not None:
+            await super()._async_restore(state)
+            self._attr_native_value = data.native_value
 
-        self._attr_native_value = val
+    def _callback(self) -> None:
+        """Refresh data."""
+        self._attr_native_value = self._read_value()
+
+        super()._callback()
 
     @property
     def available(self) -> bool:
         return (not self.sensor_error) and super().available
+
+
+class InelsStatisticsSensor(InelsSensor):
+    """Rolling statistic of an iNELS sensor, fed by the status callback."""
+
+    def __init__(
+        self,
+        device: Device,
+        key: str,
+        index: int,
+        description: InelsSensorDescription,
+        statistics: InelsRollingStatistics,
+        stat: str,
+    ) -> None:
+        """Initialize a rolling statistics sensor."""
+        self._stat = STATISTICS[stat][1]
+        self._written_available: bool | None = None
+        super().__init__(
+            device=device,
+            key=key,
+            index=index,
+            description=description,
+            statistics=statistics,
+        )
+
+    def _read_value(self) -> Any:
+        """Read the statistic, the samples are added by _status."""
+        super()._read_value()
+        return self._stat(self._statistics)
+
+    def _status(self, received: float) -> None:
+        """Add the value of a status and write the updated statistic."""
+        super()._status(received)
+        super()._callback()
+
+    def _callback(self) -> None:
+        """Write only a (dis)connection of the device, _status writes the rest.
+
+        The device callback of a status runs before its sample is added, the
+        statistic written then would be stale and written twice.
+        """
+        if self.available != self._written_available:
+            super()._callback()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, keep the availability it was written with."""
+        self._written_available = self.available
+        super().async_write_ha_state()
+
+
+class InelsHealthSensor(CoordinatorEntity[InelsHealthCoordinator], SensorEntity):
+    """Health of the integration, sampled by the coordinator."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: InelsHealthCoordinator,
+        config_entry: ConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialize a health sensor."""
+        super().__init__(coordinator)
+
+        self.entity_description = description
+
+        self._attr_unique_id = slugify(
+            f"{config_entry.entry_id}_broker_{description.key}"
+        )
+        self.entity_id = f"{Platform.SENSOR}.{self._attr_unique_id}"
+        self._attr_name = f"iNELS broker {description.name}"
+        self._attr_device_info = broker_device_info(config_entry)
+
+    @property
+    def native_value(self) -> Any:
+        """Return the last sampled value."""
+        return self.coordinator.data[self.entity_description.key]
@@ -2,40 +2,45 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cache
 from typing import Any
 
 from inelsmqtt.devices import Device
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import STATE_ON, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util import slugify
 
+from .alert import InelsAlertTracker
 from .entity import InelsBaseEntity
+from .hotplug import async_listen_new_devices
 from .const import (
     DEVICES,
     DOMAIN,
     ICON_SWITCH,
-    LOGGER,
     OLD_ENTITIES,
 )
 
 
 # SWITCH PLATFORM
-@dataclass
+@dataclass(slots=True)
 class InelsSwitchAlert:
     """Inels switch alert property description."""
 
     key: str
+    name: str
     message: str
 
 
-relay_overflow = InelsSwitchAlert(key="overflow", message="Relay overflow in %s of %d")
+relay_overflow = InelsSwitchAlert(
+    key="overflow", name="Overflow", message="Relay overflow in %s of %s"
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class InelsSwitchType:
     """Inels switch property description"""
 
@@ -58,14 +63,13 @@ async def async_setup_entry(
 ) -> None:
     """Load iNELS switch.."""
     device_list: list[Device] = hass.data[DOMAIN][config_entry.entry_id][DEVICES]
-    old_entities: list[str] = hass.data[DOMAIN][config_entry.entry_id][
+    old_entities: set[str] = hass.data[DOMAIN][config_entry.entry_id][
         OLD_ENTITIES
     ].get(Platform.SWITCH)
 
-    items = INELS_SWITCH_TYPES.items()
-    entities: list[InelsBaseEntity] = []
-    for device in device_list:
-        for key, type_dict in items:
+    def device_entities(device: Device) -> list[InelsBaseEntity]:
+        entities: list[InelsBaseEntity] = []
+        for key in INELS_SWITCH_TYPES:
             if hasattr(device.state, key):
                 if len(device.state.__dict__[key]) == 1:
                     entities.append(
@@ -73,12 +77,7 @@ async def async_setup_entry(
                             device=device,
                             key=key,
                             index=0,
-                            description=InelsSwitchEntityDescription(
-                                key=key,
-                                name=type_dict.name,
-                                icon=type_dict.icon,
-                                overload_key=type_dict.overflow,
-                            ),
+                            description=_switch_description(key, -1),
                         )
                     )
                 else:
@@ -88,20 +87,17 @@ async def async_setup_entry(
                                 device=device,
                                 key=key,
                                 index=k,
-                                description=InelsSwitchEntityDescription(
-                                    key=f"{key}{k}",
-                                    name=f"{type_dict.name} {k+1}",
-                                    icon=type_dict.icon,
-                                    overload_key=type_dict.overflow,
-                                ),
+                                description=_switch_description(key, k),
                             )
                         )
+        return entities
+
+    entities = [entity for device in device_list for entity in device_entities(device)]
     async_add_entities(entities, False)
+    async_listen_new_devices(hass, config_entry, device_entities, async_add_entities)
 
     if old_entities:
-        for entity in entities:
-            if entity.entity_id in old_entities:
-                old_entities.pop(old_entities.index(entity.entity_id))
+        old_entities.difference_update(entity.entity_id for entity in entities)
 
     hass.data[DOMAIN][config_entry.entry_id][Platform.SWITCH] = old_entities
 
@@ -114,6 +110,19 @@ class InelsSwitchEntityDescription(SwitchEntityDescription):
     alerts: list[InelsSwitchAlert] | None = None
 
 
+@cache
+def _switch_description(key: str, index: int) -> InelsSwitchEntityDescription:
+    """Return the shared description of a relay, '-1' for single relay."""
+    type_dict = INELS_SWITCH_TYPES[key]
+    return InelsSwitchEntityDescription(
+        key=key if index == -1 else f"{key}{index}",
+        name=type_dict.name if index == -1 else f"{type_dict.name} {index+1}",
+        icon=type_dict.icon,
+        overload_key=type_dict.overflow,
+        alerts=type_dict.alerts,
+    )
+
+
 class InelsBusSwitch(InelsBaseEntity, SwitchEntity):
     """The platform class required by Home Assistant, bus version."""
 
@@ -135,24 +144,26 @@ class InelsBusSwitch(InelsBaseEntity, SwitchEntity):
         self.entity_id = f"{Platform.SWITCH}.{self._attr_unique_id}"
         self._attr_name = f"{self._attr_name} {description.name}"
 
+        self._alerts = InelsAlertTracker(description.alerts)
+        self._alerts.reset(self._device.state.__dict__[self.key][self.index])
+
+    def _callback(self) -> None:
+        """Evaluate the alerts once per status change of the relay."""
+        self._alerts.update(
+            self, self._device_id, self._device.state.__dict__[self.key][self.index]
+        )
+        super()._callback()
+
     @property
     def available(self) -> bool:
         """Return entity availability."""
-        if self.entity_description.alerts:
-            last_state = self._device.last_values.ha_value.__dict__[self.key][
-                self.index
-            ]
-            for alert in self.entity_description.alerts:
-                if hasattr(self._device.state, alert.key):
-                    if self._device.state.__dict__[alert.key]:
-                        if not last_state.__dict__[alert.key]:
-                            LOGGER.warning(alert.message, self.name, self._device_id)
-                        return False
-        return super().available
+        return not self._alerts.active and super().available
 
     @property
     def is_on(self) -> bool | None:
         """Return if switch is on."""
+        if (last := self._last_state) is not None:
+            return last.state == STATE_ON
         state = self._device.state
         return state.__dict__[self.key][self.index].is_on
 
@@ -169,7 +180,7 @@ class InelsBusSwitch(InelsBaseEntity, SwitchEntity):
         ha_val = self._device.state
         ha_val.__dict__[self.key][self.index].is_on = False
 
-        await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+        await self._async_set_ha_value(ha_val)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Instruct the switch to turn on."""
@@ -179,4 +190,4 @@ class InelsBusSwitch(InelsBaseEntity, SwitchEntity):
         ha_val = self._device.state
         ha_val.__dict__[self.key][self.index].is_on = True
 
-        await self.hass.async_add_executor_job(self._device.set_ha_value, ha_val)
+        await self._async_set_ha_value(ha_val)
@@ -0,0 +1,146 @@
+"""Brightness transitions for iNELS lights."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import time
+
+from inelsmqtt.devices import Device
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import LOGGER, RAMP_STEP_INTERVAL
+from .executor import InelsExecutor
+
+
+@dataclass(slots=True)
+class InelsRamp:
+    """Brightness ramp of a single light channel."""
+
+    device: Device
+    key: str
+    index: int
+    start: int
+    target: int
+    started: float
+    duration: float
+    last: int | None = None
+
+    def brightness(self, now: float) -> int:
+        """Return the brightness (0-100) the ramp should have at the given time."""
+        if now >= self.started + self.duration:
+            return self.target
+        progress = (now - self.started) / self.duration
+        return round(self.start + (self.target - self.start) * progress)
+
+    def finished(self, now: float) -> bool:
+        """Return if the ramp reached its target."""
+        return now >= self.started + self.duration
+
+
+def _publish_brightness(device: Device, steps: list[tuple[str, int, int]]) -> bool:
+    """Write brightness of several channels of one device in a single publish."""
+    ha_val = device.get_value().ha_value
+    for key, index, brightness in steps:
+        ha_val.__dict__[key][index].brightness = brightness
+    return device.set_ha_value(ha_val)
+
+
+class InelsRampScheduler:
+    """Step the brightness ramps of all lights of a config entry with one timer.
+
+    The protocol has no native ramp parameter, so ramps are emulated by
+    stepping the brightness. Channels of the same device are merged into one
+    publish per step and a step is skipped while the previous one is still
+    being published, so fading a whole room does not flood the bus.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        executor: InelsExecutor,
+        interval: float = RAMP_STEP_INTERVAL,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._executor = executor
+        self._interval = timedelta(seconds=interval)
+        self._ramps: dict[tuple[str, str, int], InelsRamp] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._stepping = False
+
+    @callback
+    def async_start(
+        self, device: Device, key: str, index: int, target: int, duration: float
+    ) -> None:
+        """Start (or restart) a ramp of a channel towards the target brightness."""
+        start = device.state.__dict__[key][index].brightness
+        self._ramps[(device.unique_id, key, index)] = InelsRamp(
+            device=device,
+            key=key,
+            index=index,
+            start=start,
+            target=target,
+            started=time.monotonic(),
+            duration=duration,
+        )
+
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_time_interval(
+                self._hass, self._async_step, self._interval
+            )
+
+    @callback
+    def async_cancel(self, device: Device, key: str, index: int) -> None:
+        """Stop the ramp of a channel, if any."""
+        self._ramps.pop((device.unique_id, key, index), None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop all ramps and stop the timer."""
+        self._ramps.clear()
+        self._stop_timer()
+
+    @callback
+    def _stop_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    async def _async_step(self, _now: datetime) -> None:
+        """Move all running ramps one step further."""
+        if self._stepping:
+            # previous step is still being published, don't queue more on the bus
+            return
+
+        self._stepping = True
+        try:
+            now = time.monotonic()
+            steps: dict[str, tuple[Device, list[tuple[str, int, int]]]] = {}
+            for ramp_id, ramp in list(self._ramps.items()):
+                brightness = ramp.brightness(now)
+                if ramp.finished(now):
+                    del self._ramps[ramp_id]
+                if brightness == ramp.last:
+                    continue
+                ramp.last = brightness
+                steps.setdefault(ramp.device.unique_id, (ramp.device, []))[1].append(
+                    (ramp.key, ramp.index, brightness)
+                )
+
+            results = await asyncio.gather(
+                *(
+                    self._executor.async_run(_publish_brightness, device, device_steps)
+                    for device, device_steps in steps.values()
+                ),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    LOGGER.warning("Light transition step failed: %s", result)
+        finally:
+            self._stepping = False
+            if not self._ramps:
+                self._stop_timer()
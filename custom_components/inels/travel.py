@@ -0,0 +1,269 @@
+"""Travel time position model for iNELS covers without position status."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    TRAVEL_CALIBRATION_MIN_RATIO,
+    TRAVEL_SAVE_DELAY,
+    TRAVEL_UPDATE_INTERVAL,
+)
+
+STORAGE_VERSION = 1
+
+OPENING = 1
+CLOSING = -1
+
+
+def travel_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the cover travel times of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.travel")
+
+
+@dataclass(slots=True)
+class InelsTravel:
+    """Estimated position (0 closed - 100 open) of one cover."""
+
+    open_time: float | None = None  # s, from closed to open
+    close_time: float | None = None  # s, from open to closed
+    position: float | None = None
+    reports_stop: bool = False  # device reports when the motor stops
+    direction: int = 0  # OPENING, CLOSING or 0 when standing
+    started: float = 0.0
+    start_position: float | None = None
+    target: int | None = None
+
+    @property
+    def moving(self) -> bool:
+        """Return if the cover is moving."""
+        return self.direction != 0
+
+    @property
+    def known(self) -> bool:
+        """Return if the position can be estimated."""
+        return (
+            self.position is not None
+            and self.open_time is not None
+            and self.close_time is not None
+        )
+
+    def duration(self, direction: int) -> float | None:
+        """Return the full travel time in the direction."""
+        return self.open_time if direction == OPENING else self.close_time
+
+    def position_at(self, now: float) -> float | None:
+        """Return the position estimated at the given time."""
+        if not self.moving:
+            return self.position
+        duration = self.duration(self.direction)
+        if duration is None or self.start_position is None:
+            return None
+        position = (
+            self.start_position + self.direction * 100 * (now - self.started) / duration
+        )
+        return min(100.0, max(0.0, position))
+
+    def advance(self, now: float) -> None:
+        """Take the estimate at the given time, an unknown one keeps the position."""
+        if (position := self.position_at(now)) is not None:
+            self.position = position
+
+    def time_to(self, position: float) -> float | None:
+        """Return the time the moving cover needs to get to the position."""
+        duration = self.duration(self.direction)
+        if duration is None or self.position is None:
+            return None
+        return max(0.0, (position - self.position) * self.direction * duration / 100)
+
+    def at_end(self) -> bool:
+        """Return if the cover reached the end in its direction."""
+        end = 100.0 if self.direction == OPENING else 0.0
+        return self.position == end
+
+
+class InelsTravelTracker:
+    """Estimate the position of all the moving covers of a config entry.
+
+    A single timer runs only while some cover is moving. Travel times are set
+    per cover and, when calibration is enabled, taken from full runs that
+    start at an end position and end with the motor stopped by the device.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: Store[dict[str, Any]],
+        calibrate: bool,
+        interval: float = TRAVEL_UPDATE_INTERVAL,
+    ) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._store = store
+        self._calibrate = calibrate
+        self._interval = timedelta(seconds=interval)
+        self._covers: dict[str, InelsTravel] = {}
+        self._moving: dict[str, Callable[[], None]] = {}
+        self._stored: dict[str, Any] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Load the stored travel times and positions."""
+        self._stored = await self._store.async_load() or {}
+
+    def get(self, cover_id: str, reports_stop: bool) -> InelsTravel:
+        """Return the travel model of a cover."""
+        if (travel := self._covers.get(cover_id)) is None:
+            stored = self._stored.get(cover_id, {})
+            travel = self._covers[cover_id] = InelsTravel(
+                open_time=stored.get("open_time"),
+                close_time=stored.get("close_time"),
+                position=stored.get("position"),
+                reports_stop=reports_stop,
+            )
+        return travel
+
+    @callback
+    def async_set_travel_time(
+        self, cover_id: str, open_time: float, close_time: float
+    ) -> None:
+        """Set the travel times of a cover."""
+        travel = self._covers[cover_id]
+        if travel.moving:
+            self._restart(travel, time.monotonic())
+        travel.open_time = open_time
+        travel.close_time = close_time
+        self._async_save()
+
+    @callback
+    def async_start(
+        self, cover_id: str, direction: int, update: Callable[[], None]
+    ) -> bool:
+        """Mark the cover as moving in the direction, return if it is tracked.
+
+        Without a travel time in the direction or a known position there is
+        nothing to estimate, the cover is not tracked.
+        """
+        travel = self._covers[cover_id]
+        now = time.monotonic()
+        if travel.direction == direction:
+            return True
+        if travel.moving:
+            travel.advance(now)
+        if travel.duration(direction) is None or travel.position is None:
+            self._stop_tracking(cover_id, travel)
+            return False
+
+        travel.direction = direction
+        travel.started = now
+        travel.start_position = travel.position
+        self._moving[cover_id] = update
+
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_time_interval(
+                self._hass, self._async_update, self._interval
+            )
+        return True
+
+    @callback
+    def async_stop(self, cover_id: str, by_device: bool) -> None:
+        """Mark the cover as standing, by_device if it stopped on its own."""
+        travel = self._covers[cover_id]
+        if not travel.moving:
+            return
+
+        now = time.monotonic()
+        if by_device and self._calibrate:
+            self._calibrate_run(cover_id, travel, now)
+        else:
+            travel.advance(now)
+        self._stop_tracking(cover_id, travel)
+        self._async_save()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the timer and save the positions."""
+        self._stop_timer()
+        now = time.monotonic()
+        for travel in self._covers.values():
+            if travel.moving:
+                travel.advance(now)
+                travel.direction = 0
+        self._moving.clear()
+        self._async_save()
+
+    def _restart(self, travel: InelsTravel, now: float) -> None:
+        """Take the current estimate as the start of the movement."""
+        travel.advance(now)
+        travel.started = now
+        travel.start_position = travel.position
+
+    def _calibrate_run(self, cover_id: str, travel: InelsTravel, now: float) -> None:
+        """Take the run as a full travel, if it could have been one."""
+        elapsed = now - travel.started
+        duration = travel.duration(travel.direction)
+        if duration is not None and elapsed < duration * TRAVEL_CALIBRATION_MIN_RATIO:
+            # too short for a full run, most likely stopped by a wall switch
+            travel.advance(now)
+            return
+
+        start = 0.0 if travel.direction == OPENING else 100.0
+        if travel.start_position == start:
+            measured = elapsed if duration is None else (duration + elapsed) / 2
+            if travel.direction == OPENING:
+                travel.open_time = measured
+            else:
+                travel.close_time = measured
+            LOGGER.debug("Calibrated travel time of %s to %.1f s", cover_id, measured)
+
+        travel.position = 100.0 - start
+
+    async def _async_update(self, _now: datetime) -> None:
+        """Move the estimates of all the moving covers."""
+        now = time.monotonic()
+        for cover_id, update in list(self._moving.items()):
+            travel = self._covers[cover_id]
+            travel.advance(now)
+            if not travel.reports_stop and travel.at_end():
+                # the motor stops at the end-stop without telling, finish here
+                self._stop_tracking(cover_id, travel)
+                self._async_save()
+            update()
+
+        if not self._moving:
+            self._stop_timer()
+
+    def _stop_tracking(self, cover_id: str, travel: InelsTravel) -> None:
+        """Take the cover as standing."""
+        travel.direction = 0
+        travel.target = None
+        self._moving.pop(cover_id, None)
+
+    @callback
+    def _stop_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, TRAVEL_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        for cover_id, travel in self._covers.items():
+            self._stored[cover_id] = {
+                "open_time": travel.open_time,
+                "close_time": travel.close_time,
+                "position": None if travel.moving else travel.position,
+            }
+        return self._stored
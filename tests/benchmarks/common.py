@@ -0,0 +1,239 @@
+"""Common helpers of the iNELS benchmarks.
+
+The benchmarks run the integration on a bare Home Assistant core, with real
+inelsmqtt devices decoding prebuilt statuses. No broker is involved, a stand-in
+of the broker session holds the statuses and routes them to the listeners.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+import importlib
+import logging
+from pathlib import Path
+from typing import Any
+
+from inelsmqtt.devices import Device
+
+from homeassistant import config_entries, loader
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity as entity_helper,
+    entity_platform,
+    entity_registry as er,
+    restore_state,
+)
+from homeassistant.helpers.entity import Entity
+
+from custom_components.inels import PLATFORMS
+from custom_components.inels.const import (
+    BROKER,
+    BROKER_CONFIG,
+    DEVICES,
+    DOMAIN,
+    EXECUTOR,
+    OLD_ENTITIES,
+    OPTIONS,
+)
+from custom_components.inels.executor import InelsExecutor
+
+# (device type, status bytes) of the devices, with the entities they make
+TI3_10B = ("157", 2)  # 1 temperature
+TI3_60M = ("159", 12)  # 6 indexed temperatures
+ADC3_60M = ("156", 24)  # 6 indexed analog inputs
+SA3_01B = ("100", 5)  # 1 relay, temperature
+SA3_04M = ("106", 5)  # 4 relays, 4 inputs, 12 entities
+SA3_06M = ("107", 7)  # 6 relays, 6 inputs, 18 entities
+SA3_022M = ("109", 28)  # 16 relays, shutters, inputs
+IM3_140M = ("121", 4)  # 14 inputs
+GSB3_90SX = ("103", 14)  # 9 interface buttons, inputs and climate sensors
+
+# one of each in ten devices, about 15 entities per device
+INSTALLATION = [
+    TI3_60M,
+    TI3_10B,
+    ADC3_60M,
+    SA3_01B,
+    SA3_01B,
+    SA3_04M,
+    SA3_06M,
+    SA3_022M,
+    IM3_140M,
+    GSB3_90SX,
+]
+
+
+def status(byte: int, size: int) -> bytes:
+    """Return a status of the size with all the bytes set to the value."""
+    return f"{byte:02X}\n".encode() * size
+
+
+class FakeMqtt:
+    """Broker session holding the statuses, as InelsMqtt after the discovery."""
+
+    def __init__(self) -> None:
+        """Initialize the session."""
+        self._messages: dict[str, Any] = {}
+        self._last_values: dict[str, Any] = {}
+        self.list_of_listeners: dict[str, dict[str, Callable[[bool], None]]] = {}
+
+    def messages(self) -> dict[str, Any]:
+        """Return the last statuses by topic."""
+        return self._messages
+
+    def last_value(self, topic: str) -> Any:
+        """Return the status before the last one."""
+        return self._last_values.get(topic)
+
+    def subscribe(self, topic: str, qos: int = 0, options=None, properties=None):
+        """Subscribe nothing, the statuses are delivered by the benchmark."""
+        return None
+
+    def subscribe_listener(
+        self, topic: str, unique_id: str, fnc: Callable[[bool], None]
+    ) -> None:
+        """Register the listener of a device."""
+        stripped = "/".join(topic.split("/")[2:])
+        self.list_of_listeners.setdefault(stripped, {})[unique_id] = fnc
+
+    def publish(self, topic: str, payload, qos=0, retain=True, properties=None):
+        """Drop the command."""
+        return True
+
+    def deliver(self, topic: str, payload: bytes) -> None:
+        """Take a status and call the listeners, as the broker session does."""
+        self._last_values[topic] = self._messages.get(topic, payload)
+        self._messages[topic] = payload
+        fragments = topic.split("/")
+        listeners = self.list_of_listeners.get("/".join(fragments[2:]), {})
+        for fnc in list(listeners.values()):
+            fnc(fragments[1] == "connected")
+
+
+def make_devices(
+    mqtt: FakeMqtt, count: int, shapes: list[tuple[str, int]]
+) -> list[Device]:
+    """Return the devices of the shapes in turn, connected with a first status."""
+    devices = []
+    for address in range(count):
+        device_type, size = shapes[address % len(shapes)]
+        topic = f"inels/status/7c1ef2/{device_type}/{address:06X}"
+        mqtt._messages[topic] = mqtt._last_values[topic] = status(0, size)
+        mqtt._messages[topic.replace("/status/", "/connected/", 1)] = b"on\n"
+        devices.append(Device(mqtt, topic))
+    return devices
+
+
+async def async_start_hass(
+    config_dir: Path, devices: int, shapes: list[tuple[str, int]]
+) -> HomeAssistant:
+    """Return a core with the registries and an iNELS entry of the devices."""
+    hass = HomeAssistant(str(config_dir))
+    loader.async_setup(hass)
+    entity_helper.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await er.async_load(hass)
+    await dr.async_load(hass)
+    await restore_state.async_load(hass)
+
+    entry = config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="iNELS",
+        data={"host": "localhost", "port": 1883},
+        source=config_entries.SOURCE_USER,
+        options={},
+    )
+    hass.config_entries._entries[entry.entry_id] = entry  # no setup of the entry
+
+    mqtt = FakeMqtt()
+    hass.data[DOMAIN] = {
+        entry.entry_id: {
+            BROKER_CONFIG: entry.data,
+            OPTIONS: {},
+            EXECUTOR: InelsExecutor(hass, entry.entry_id),
+            BROKER: mqtt,
+            DEVICES: make_devices(mqtt, devices, shapes),
+        }
+    }
+    snapshot_old_entities(hass)
+    return hass
+
+
+async def async_stop_hass(hass: HomeAssistant) -> None:
+    """Stop the core and the executor of the entry."""
+    for inels_data in hass.data[DOMAIN].values():
+        inels_data[EXECUTOR].shutdown()
+    await hass.async_stop(force=True)
+
+
+def get_entry(hass: HomeAssistant) -> config_entries.ConfigEntry:
+    """Return the iNELS entry."""
+    return hass.config_entries.async_entries()[0]
+
+
+def get_mqtt(hass: HomeAssistant) -> FakeMqtt:
+    """Return the broker session of the entry."""
+    return hass.data[DOMAIN][get_entry(hass).entry_id][BROKER]
+
+
+def snapshot_old_entities(hass: HomeAssistant) -> None:
+    """Take the registered entities as old ones, as the setup of the entry."""
+    entry = get_entry(hass)
+    old_entities: dict[str, set[str]] = {}
+    for entity in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id):
+        old_entities.setdefault(entity.domain, set()).add(entity.entity_id)
+    hass.data[DOMAIN][entry.entry_id][OLD_ENTITIES] = old_entities
+
+
+def make_platforms(hass: HomeAssistant) -> list[entity_platform.EntityPlatform]:
+    """Return an entity platform of each of the iNELS platforms."""
+    return [
+        entity_platform.EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(f"{DOMAIN}.{platform}"),
+            domain=platform,
+            platform_name=DOMAIN,
+            platform=importlib.import_module(f"custom_components.inels.{platform}"),
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        for platform in PLATFORMS
+    ]
+
+
+async def async_construct_entities(
+    hass: HomeAssistant, platforms: Iterable[entity_platform.EntityPlatform]
+) -> list[Entity]:
+    """Set up the platforms with the entities kept out of the core."""
+    entry = get_entry(hass)
+    entities: list[Entity] = []
+
+    def add_entities(new_entities: Iterable[Entity], update_before_add=False):
+        entities.extend(new_entities)
+
+    for platform in platforms:
+        # the platforms register their entity services on the current one
+        entity_platform.current_platform.set(platform)
+        await platform.platform.async_setup_entry(hass, entry, add_entities)
+    return entities
+
+
+async def async_setup_platforms(
+    hass: HomeAssistant, platforms: Iterable[entity_platform.EntityPlatform]
+) -> None:
+    """Set up the platforms, each entity registered and its state written."""
+    entry = get_entry(hass)
+    for platform in platforms:
+        assert await platform.async_setup_entry(entry)
+
+
+async def async_reset_platforms(
+    platforms: Iterable[entity_platform.EntityPlatform],
+) -> None:
+    """Remove the entities of the platforms, the registry keeps them."""
+    for platform in platforms:
+        await platform.async_reset()
+
@@ -0,0 +1,16 @@
+"""Fixtures of the iNELS benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Return the event loop of the core."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
@@ -0,0 +1,113 @@
+"""Benchmarks of the fan-out of a status to the entities of its device.
+
+A status goes through the listener of the device, Device.callback and the
+callbacks of the changed entities, down to their state writes. The statuses
+are delivered in the loop thread, so a message is timed until its states are
+written. Every status changes all the entities of its device.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+import statistics
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from .common import (
+    SA3_04M,
+    SA3_06M,
+    TI3_10B,
+    async_reset_platforms,
+    async_setup_platforms,
+    async_start_hass,
+    async_stop_hass,
+    get_mqtt,
+    make_platforms,
+    status,
+)
+
+DEVICES = 100
+MESSAGES = 2000  # per round, spread over the devices
+
+# entities of each device: a thermometer, a 4 and a 6 channel relay unit
+SHAPES = {1: TI3_10B, 12: SA3_04M, 18: SA3_06M}
+
+
+@pytest.fixture(
+    scope="module", params=list(SHAPES), ids=lambda count: f"{count}_entities"
+)
+def hass(request, loop, tmp_path_factory) -> Generator[HomeAssistant, None, None]:
+    """Return a core with the entities of the devices set up."""
+    hass = loop.run_until_complete(
+        async_start_hass(
+            tmp_path_factory.mktemp("config"), DEVICES, [SHAPES[request.param]]
+        )
+    )
+    platforms = make_platforms(hass)
+    loop.run_until_complete(async_setup_platforms(hass, platforms))
+    assert len(hass.states.async_entity_ids()) >= DEVICES * request.param
+    yield hass
+    loop.run_until_complete(async_reset_platforms(platforms))
+    loop.run_until_complete(async_stop_hass(hass))
+
+
+def _messages(hass: HomeAssistant) -> list[tuple[str, bytes]]:
+    """Return the statuses of a round, two in turn to each device."""
+    topics = [topic for topic in get_mqtt(hass).messages() if "/status/" in topic]
+    size = len(get_mqtt(hass).messages()[topics[0]]) // 3
+    payloads = [status(0xFF, size), status(0, size)]
+    return [
+        (topics[index % len(topics)], payloads[index // len(topics) % 2])
+        for index in range(MESSAGES)
+    ]
+
+
+async def _async_deliver(
+    hass: HomeAssistant, messages: list[tuple[str, bytes]], latencies: list[float]
+) -> None:
+    """Deliver the statuses one by one, each until its states are written."""
+    mqtt = get_mqtt(hass)
+    for topic, payload in messages:
+        started = time.perf_counter()
+        mqtt.deliver(topic, payload)
+        await asyncio.sleep(0)  # the state writes scheduled by the callbacks
+        latencies.append(time.perf_counter() - started)
+
+
+def test_callback_fanout(benchmark, loop, hass: HomeAssistant, request) -> None:
+    """Deliver statuses changing all the entities of their devices."""
+    messages = _messages(hass)
+    latencies: list[float] = []
+
+    states = hass.states.async_all()
+    loop.run_until_complete(_async_deliver(hass, messages[:1], []))
+    changed = [
+        state
+        for state in states
+        if hass.states.get(state.entity_id).last_updated != state.last_updated
+    ]
+    assert len(changed) == request.node.callspec.params["hass"]
+
+    benchmark.pedantic(
+        lambda: loop.run_until_complete(_async_deliver(hass, messages, latencies)),
+        rounds=10,
+        warmup_rounds=1,
+    )
+
+    if benchmark.disabled:
+        return
+
+    latencies = latencies[MESSAGES:]  # without the warmup round
+    percentiles = statistics.quantiles(latencies, n=100)
+    benchmark.extra_info.update(
+        {
+            "messages_per_s": round(MESSAGES / benchmark.stats.stats.mean),
+            "latency_p50_us": round(percentiles[49] * 1e6, 1),
+            "latency_p90_us": round(percentiles[89] * 1e6, 1),
+            "latency_p99_us": round(percentiles[98] * 1e6, 1),
+            "latency_max_us": round(max(latencies) * 1e6, 1),
+        }
+    )
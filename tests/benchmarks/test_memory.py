@@ -0,0 +1,103 @@
+"""Benchmark of the memory held by the devices and their entities.
+
+The devices of an installation are built and their platforms set up with
+tracemalloc tracing. The memory still held afterwards is reported per device,
+and per entity class for the memory held by the construction of its entities:
+the entity, its description, its helpers and its values. The rest is held by
+the core for the added entities, in the registries, states and listeners.
+"""
+from __future__ import annotations
+
+from collections import Counter
+import tracemalloc
+from typing import Any
+
+from homeassistant.helpers.entity import Entity
+
+from custom_components.inels.const import DEVICES, DOMAIN
+
+from .common import (
+    INSTALLATION,
+    async_reset_platforms,
+    async_setup_platforms,
+    async_start_hass,
+    async_stop_hass,
+    get_entry,
+    get_mqtt,
+    make_devices,
+    make_platforms,
+    snapshot_old_entities,
+)
+
+COUNT = 1000  # devices of the installation
+
+# bytes held, about a quarter above the sizes of a run
+DEVICE_BUDGET = 156000  # per device, with its entities
+ENTITY_BUDGET = {
+    "InelsAlertBinarySensor": 720,
+    "InelsBinaryInputSensor": 750,
+    "InelsBinarySensor": 750,
+    "InelsBusSwitch": 1040,
+    "InelsButton": 700,
+    "InelsButtonEvent": 860,
+    "InelsCover": 810,
+    "InelsHealthSensor": 1310,
+    "InelsSensor": 780,
+}
+
+
+def test_memory(benchmark, loop, tmp_path_factory, monkeypatch) -> None:
+    """Build the devices and set up their platforms, reporting the memory held."""
+    hass = loop.run_until_complete(
+        async_start_hass(tmp_path_factory.mktemp("config"), 0, INSTALLATION)
+    )
+    inels_data = hass.data[DOMAIN][get_entry(hass).entry_id]
+    platforms = make_platforms(hass)
+    held: Counter[str] = Counter()
+    total: list[int] = []
+
+    def construct(cls: type[Entity], *args: Any, **kwargs: Any) -> Entity:
+        """Construct an entity, counting the memory it holds to its class."""
+        before = tracemalloc.get_traced_memory()[0]
+        entity = type.__call__(cls, *args, **kwargs)
+        held[cls.__name__] += tracemalloc.get_traced_memory()[0] - before
+        return entity
+
+    # the entity classes are constructed by calling their metaclass
+    monkeypatch.setattr(type(Entity), "__call__", construct, raising=False)
+
+    def set_up() -> None:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        inels_data[DEVICES] = make_devices(get_mqtt(hass), COUNT, INSTALLATION)
+        snapshot_old_entities(hass)
+        loop.run_until_complete(async_setup_platforms(hass, platforms))
+        total.append(tracemalloc.get_traced_memory()[0] - before)
+        tracemalloc.stop()
+
+    try:
+        # a single round, traced, timed only to be saved with the others
+        benchmark.pedantic(set_up, rounds=1, iterations=1)
+        monkeypatch.undo()
+
+        counts = Counter(
+            type(entity).__name__
+            for platform in platforms
+            for entity in platform.entities.values()
+        )
+        per_entity = {name: round(held[name] / counts[name]) for name in counts}
+        benchmark.extra_info.update(
+            {
+                "entities": counts.total(),
+                "bytes_per_device": round(total[0] / COUNT),
+                "bytes_per_entity": dict(sorted(per_entity.items())),
+            }
+        )
+        assert total[0] / COUNT < DEVICE_BUDGET
+        for name, size in per_entity.items():
+            assert size < ENTITY_BUDGET[name], name
+    finally:
+        tracemalloc.stop()
+        monkeypatch.undo()
+        loop.run_until_complete(async_reset_platforms(platforms))
+        loop.run_until_complete(async_stop_hass(hass))
@@ -0,0 +1,127 @@
+"""Benchmarks of the platform setup of installations of 100 to 10,000 devices.
+
+Each stage is timed on its own: the construction of the entities, the setup
+of the platforms on a restart, where every entity is reconciled with its
+registry entry, and the first state write of all the entities.
+"""
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.inels.const import DEVICES, DOMAIN
+
+from .common import (
+    INSTALLATION,
+    async_construct_entities,
+    async_reset_platforms,
+    async_setup_platforms,
+    async_start_hass,
+    async_stop_hass,
+    get_entry,
+    make_platforms,
+    snapshot_old_entities,
+)
+
+# the largest installation is set up only once per stage
+ROUNDS = {100: 10, 1000: 3, 10000: 1}
+
+
+@pytest.fixture(
+    scope="module", params=list(ROUNDS), ids=lambda count: f"{count}_devices"
+)
+def hass(request, loop, tmp_path_factory) -> Generator[HomeAssistant, None, None]:
+    """Return a core with an installation of the devices."""
+    hass = loop.run_until_complete(
+        async_start_hass(tmp_path_factory.mktemp("config"), request.param, INSTALLATION)
+    )
+    yield hass
+    loop.run_until_complete(async_stop_hass(hass))
+
+
+def _rounds(hass: HomeAssistant) -> int:
+    return ROUNDS[len(hass.data[DOMAIN][get_entry(hass).entry_id][DEVICES])]
+
+
+def test_entity_construction(benchmark, loop, hass: HomeAssistant) -> None:
+    """Construct the entities of all the platforms, none of them added."""
+
+    def setup():
+        snapshot_old_entities(hass)
+        return (make_platforms(hass),), {}
+
+    def construct(platforms: list[EntityPlatform]) -> list[Entity]:
+        return loop.run_until_complete(async_construct_entities(hass, platforms))
+
+    entities = benchmark.pedantic(
+        construct, setup=setup, rounds=_rounds(hass), warmup_rounds=1
+    )
+    benchmark.extra_info["entities"] = len(entities)
+    assert entities
+
+
+def test_registry_reconciliation(benchmark, loop, hass: HomeAssistant) -> None:
+    """Set up the platforms with all the entities in the registry, as on restart.
+
+    The warmup round registers the entities, the timed rounds find them there.
+    The first state write of the entities is part of their setup.
+    """
+    added: list[list[EntityPlatform]] = []
+    entities: list[int] = []
+
+    def setup():
+        # the entities of the last round go first, the registry keeps them
+        while added:
+            loop.run_until_complete(async_reset_platforms(added.pop()))
+        snapshot_old_entities(hass)
+        added.append(make_platforms(hass))
+        return (added[-1],), {}
+
+    def set_up(platforms: list[EntityPlatform]) -> None:
+        loop.run_until_complete(async_setup_platforms(hass, platforms))
+        entities.append(sum(len(platform.entities) for platform in platforms))
+
+    try:
+        benchmark.pedantic(
+            set_up, setup=setup, rounds=_rounds(hass), warmup_rounds=1
+        )
+        benchmark.extra_info["entities"] = entities[-1]
+        assert len(set(entities)) == 1  # a restart sets up the same entities
+    finally:
+        while added:
+            loop.run_until_complete(async_reset_platforms(added.pop()))
+
+
+def test_first_state_write(benchmark, loop, hass: HomeAssistant) -> None:
+    """Write the states of all the entities, none of them in the core yet."""
+    snapshot_old_entities(hass)
+    platforms = make_platforms(hass)
+    loop.run_until_complete(async_setup_platforms(hass, platforms))
+    entities = [
+        entity for platform in platforms for entity in platform.entities.values()
+    ]
+
+    def setup():
+        for entity in entities:
+            hass.states.async_remove(entity.entity_id)
+
+    async def async_write() -> None:
+        for entity in entities:
+            entity.async_write_ha_state()
+
+    try:
+        benchmark.pedantic(
+            lambda: loop.run_until_complete(async_write()),
+            setup=setup,
+            rounds=_rounds(hass),
+            warmup_rounds=1,
+        )
+        benchmark.extra_info["entities"] = len(entities)
+        assert len(hass.states.async_entity_ids()) == len(entities)
+    finally:
+        loop.run_until_complete(async_reset_platforms(platforms))
@@ -0,0 +1,73 @@
+"""Benchmarks of the decoding of the raw hex sensor values.
+
+The streams are the values of the channels of a bus installation in turn,
+each drifting around its level with error reports of the sensors mixed in.
+They are decoded with the cache cleared and with the cache warm.
+"""
+from __future__ import annotations
+
+import random
+
+from inelsmqtt.const import BUS_SENSOR_ERRORS
+import pytest
+
+from custom_components.inels.sensor import _process_value
+
+VALUES = 10000  # per stream
+CHANNELS = 60  # sensors reporting in turn
+ERROR_RATE = 0.01  # of the reports being errors
+
+
+def _stream(digits: int, level: int, drift: int) -> tuple[list[str], int]:
+    """Return the values of a stream, with the number of the error reports."""
+    rng = random.Random(digits)
+    levels = [level + rng.randint(-drift * 10, drift * 10) for _ in range(CHANNELS)]
+    codes = list(BUS_SENSOR_ERRORS)
+    values = []
+    errors = 0
+    for index in range(VALUES):
+        if rng.random() < ERROR_RATE:
+            # "7", padding "F"s and the error code as the last digit
+            values.append(f"7{'F' * (digits - 2)}{rng.choice(codes):X}")
+            errors += 1
+            continue
+        channel = index % CHANNELS
+        levels[channel] += rng.randint(-drift, drift)
+        values.append(f"{levels[channel]:0{digits}X}")
+    return values, errors
+
+
+STREAMS = {
+    # temperatures of the TI3 and room units, 0.01 °C around 21 °C
+    "temps": _stream(4, 2100, 3),
+    # analog inputs of the ADC3-60M, 0.01 mV around 5 V
+    "ains": _stream(8, 500000, 40),
+}
+
+
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+@pytest.mark.parametrize("stream", list(STREAMS))
+def test_sensor_decode(benchmark, stream: str, cache: str) -> None:
+    """Decode the values of a stream."""
+    values, errors = STREAMS[stream]
+
+    def setup():
+        _process_value.cache_clear()
+        if cache == "warm":
+            for val in values:
+                _process_value(val)
+
+    def decode() -> int:
+        return sum(_process_value(val)[1] is not None for val in values)
+
+    assert benchmark.pedantic(decode, setup=setup, rounds=50, warmup_rounds=1) == errors
+
+    # the hits of the decoding alone, without the ones warming the cache
+    setup()
+    before = _process_value.cache_info()
+    decode()
+    after = _process_value.cache_info()
+    hits = after.hits - before.hits
+    benchmark.extra_info["cache_hit_ratio"] = round(
+        hits / (hits + after.misses - before.misses), 3
+    )